@@ -46,13 +46,32 @@ Response Format:
     allowing the agent to understand the structure and meaning of the data.
 """
 
+import asyncio
+import atexit
+import contextlib
+import functools
+import hashlib
+import importlib.util
 import json
 import logging
 import os
+import queue
+import selectors
+import stat
 import subprocess
 import sys
-from typing import Any, cast
-
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
+from types import ModuleType
+from typing import Any, BinaryIO, Literal, cast
+
+import httpx
+import orjson
 from openai import AzureOpenAI
 from openai.types.chat import (
     ChatCompletionAssistantMessageParam,
@@ -66,11 +85,17 @@ from openai.types.chat import (
 LOG_LEVEL = os.environ.get("LOG_LEVEL", "DEBUG").upper()
 log_level = getattr(logging, LOG_LEVEL, logging.INFO)
 
-logging.basicConfig(
-    level=log_level,
-    format="%(asctime)s [%(levelname)s] [Agent] %(message)s",
-    handlers=[logging.StreamHandler(sys.stderr)],
-)
+# Records are handed to a queue and written to stderr by a listener thread, so logging on
+# the request path never waits for the pipe to the container's log collector
+log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+stderr_handler = logging.StreamHandler(sys.stderr)
+stderr_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] [Agent] %(message)s"))
+log_listener = QueueListener(log_queue, stderr_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# The QueueHandler only merges the message arguments; stderr_handler applies the layout
+logging.basicConfig(level=log_level, format="%(message)s", handlers=[QueueHandler(log_queue)])
 logger = logging.getLogger(__name__)
 
 logger.info(f"Started service with log level {log_level}")
@@ -82,8 +107,19 @@ AZURE_DEPLOYMENT = os.environ.get("AZURE_OPENAI_DEPLOYMENT_NAME")
 AZURE_API_VERSION = os.environ.get("AZURE_OPENAI_API_VERSION", "2024-08-01-preview")
 
 if AZURE_ENDPOINT and AZURE_API_KEY and AZURE_DEPLOYMENT:
+    # One pooled HTTP/2 connection set shared by all questions, so iterations reuse warm
+    # TLS connections and concurrent questions multiplex over them
+    http_client = httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        timeout=httpx.Timeout(60.0, connect=10.0),
+    )
+    atexit.register(http_client.close)
     client = AzureOpenAI(
-        azure_endpoint=AZURE_ENDPOINT, api_key=AZURE_API_KEY, api_version=AZURE_API_VERSION
+        azure_endpoint=AZURE_ENDPOINT,
+        api_key=AZURE_API_KEY,
+        api_version=AZURE_API_VERSION,
+        http_client=http_client,
     )
     logger.info(
         f"Azure OpenAI client initialized "
@@ -100,6 +136,7 @@ else:
 MCP_SERVICES = {
     "BAG": {
         "container": "eai-bag-service",
+        "directory": "bag-service",
         "description": (
             "Query BAG (Basisregistratie Adressen en Gebouwen) for addresses "
             "and buildings. Use for questions about street addresses, postal codes, "
@@ -108,6 +145,7 @@ MCP_SERVICES = {
     },
     "BGT": {
         "container": "eai-bgt-service",
+        "directory": "bgt-service",
         "description": (
             "Query BGT (Basisregistratie Grootschalige Topografie) for detailed "
             "topographic data. Use for questions about road types, surfaces, "
@@ -116,6 +154,7 @@ MCP_SERVICES = {
     },
     "BRT": {
         "container": "eai-brt-service",
+        "directory": "brt-service",
         "description": (
             "Query BRT (Basisregistratie Topografie) for geographic names and "
             "administrative boundaries. Use for questions about neighborhoods, "
@@ -124,6 +163,7 @@ MCP_SERVICES = {
     },
     "CBS": {
         "container": "eai-cbs-service",
+        "directory": "cbs-service",
         "description": (
             "Query CBS (Statistics Netherlands) for demographics, population, "
             "income, unemployment. Use for statistical questions."
@@ -131,6 +171,7 @@ MCP_SERVICES = {
     },
     "Rijkswaterstaat": {
         "container": "eai-rijkswaterstaat-service",
+        "directory": "rijkswaterstaat-service",
         "description": (
             "Query Rijkswaterstaat for infrastructure, roads, bridges, water "
             "bodies, water levels. Use for infrastructure questions."
@@ -138,6 +179,19 @@ MCP_SERVICES = {
     },
 }
 
+# Transport used to reach the backend MCP servers:
+# - "docker": spawn `docker exec ... python server.py` and talk JSON-RPC over stdio (default)
+# - "inprocess": import each backend's server.py and call its handle_request() directly.
+#   Requires the backend sources to be available under MCP_SERVERS_DIR.
+MCP_TRANSPORT = os.environ.get("MCP_TRANSPORT", "docker").lower()
+MCP_SERVERS_DIR = os.environ.get(
+    "MCP_SERVERS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+)
+
+# Backend server modules imported for the in-process transport, keyed by container name
+_BACKEND_MODULES: dict[str, ModuleType] = {}
+_BACKEND_MODULES_LOCK = threading.Lock()
+
 # Cache for dynamically discovered tools
 # Structure: {
 #   'BAG': {
@@ -148,68 +202,457 @@ MCP_SERVICES = {
 #   ...
 # }
 _BACKEND_TOOLS_CACHE: dict[str, dict[str, Any]] | None = None
+_BACKEND_TOOLS_LOCK = threading.Lock()
 
+# The wrapper tools in OpenAI format, converted together with _BACKEND_TOOLS_CACHE
+_OPENAI_TOOLS_CACHE: list[ChatCompletionToolParam] | None = None
 
-def discover_tools_from_service(container_name: str) -> list[dict[str, Any]]:
+# Functions mapping the model's tool input to backend arguments, keyed by (service, tool).
+# Derived from the discovered input schemas; kept out of the cache entries because those are
+# written to the disk snapshot.
+_ARG_BUILDERS: dict[tuple[str, str], Callable[[dict[str, Any]], dict[str, Any]]] = {}
+
+# Snapshot of the discovered tools on disk, so a restarted agent can skip discovery.
+# The snapshot is ignored once it is older than the TTL (seconds) or MCP_SERVICES changed.
+TOOLS_CACHE_PATH = os.environ.get("AGENT_TOOLS_CACHE_PATH", "/tmp/eai-agent-tools.json")
+TOOLS_CACHE_TTL = float(os.environ.get("AGENT_TOOLS_CACHE_TTL", "3600"))
+
+# Seconds to wait for a backend MCP server to answer a single request before it is killed
+MCP_CALL_TIMEOUT = float(os.environ.get("MCP_CALL_TIMEOUT", "15"))
+
+
+class MCPTimeoutError(RuntimeError):
+    """Raised when a backend MCP server does not answer within MCP_CALL_TIMEOUT"""
+
+
+def load_backend_module(container_name: str) -> ModuleType:
     """
-    Discover available tools from an MCP service using tools/list
+    Import the server module of a backend MCP service for in-process calls
 
     Args:
-        container_name: Name of the Docker container
+        container_name: Name of the Docker container the backend normally runs in
 
     Returns:
-        List of tool definitions
+        The imported server module (cached after the first import)
     """
-    try:
+    with _BACKEND_MODULES_LOCK:
+        module = _BACKEND_MODULES.get(container_name)
+        if module is not None:
+            return module
+
+        directory = next(
+            (
+                service_info["directory"]
+                for service_info in MCP_SERVICES.values()
+                if service_info["container"] == container_name
+            ),
+            None,
+        )
+        if directory is None:
+            raise ValueError(f"Unknown backend container: {container_name}")
+
+        path = os.path.join(MCP_SERVERS_DIR, directory, "server.py")
+        spec = importlib.util.spec_from_file_location(f"eai_{directory.replace('-', '_')}", path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Cannot load backend server from {path}")
+
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _BACKEND_MODULES[container_name] = module
+        logger.info(f"Loaded {container_name} in-process from {path}")
+        return module
+
+
+def call_in_process(container_name: str, method: str, params: dict[str, Any]) -> dict[str, Any]:
+    """
+    Dispatch a JSON-RPC request straight to a backend's handle_request()
+
+    Args:
+        container_name: Name of the Docker container the backend normally runs in
+        method: JSON-RPC method name
+        params: JSON-RPC params
+
+    Returns:
+        The full JSON-RPC response
+    """
+    module = load_backend_module(container_name)
+    return module.handle_request({"jsonrpc": "2.0", "id": 1, "method": method, "params": params})
+
+
+class MCPSessionReader:
+    """
+    One background thread that reads the stdout of every backend session
+
+    Each registered pipe is non-blocking and watched by a selector; when data arrives the
+    callback registered for it parses the responses and resolves the waiting futures. This
+    keeps a single OS thread reading all backends, whatever the number of concurrent calls.
+    """
+
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        # Held while callbacks run; reentrant because a callback unregisters its pipe at EOF
+        self._lock = threading.RLock()
+        self._thread: threading.Thread | None = None
+        # Written to after (un)registering so a blocked select() picks up the change
+        self._wakeup_read, self._wakeup_write = os.pipe()
+        os.set_blocking(self._wakeup_read, False)
+        self._selector.register(self._wakeup_read, selectors.EVENT_READ, self._drain_wakeup)
+
+    def _drain_wakeup(self) -> None:
+        try:
+            while os.read(self._wakeup_read, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def register(self, fd: int, callback: Callable[[], None]) -> None:
+        """Call callback on the reader thread whenever fd becomes readable"""
+        os.set_blocking(fd, False)
+        with self._lock:
+            self._selector.register(fd, selectors.EVENT_READ, callback)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mcp-reader", daemon=True)
+                self._thread.start()
+        os.write(self._wakeup_write, b"\0")
+
+    def unregister(self, fd: int) -> None:
+        """
+        Stop watching fd (no-op when it is not registered)
+
+        Once this returns the callback is neither running nor called again, so fd may be closed.
+        """
+        with self._lock:
+            try:
+                self._selector.unregister(fd)
+            except (KeyError, ValueError):
+                return
+        os.write(self._wakeup_write, b"\0")
+
+    def _run(self) -> None:
+        while True:
+            events = self._selector.select()
+            with self._lock:
+                fd_map = self._selector.get_map()
+                for key, _ in events:
+                    # Skip pipes unregistered since select() returned; they may be closed
+                    if fd_map.get(key.fd) is not key:
+                        continue
+                    try:
+                        key.data()
+                    except Exception as e:
+                        logger.exception(f"Error reading backend MCP output: {e}")
+
+
+_READER = MCPSessionReader()
+
+
+class FrameDecoder:
+    """
+    Incremental splitter for the newline-delimited JSON-RPC messages a backend writes to stdout
+
+    The search for the next newline resumes where the previous chunk ended, so a large
+    response arriving in many chunks is scanned only once.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        # Bytes at the start of the buffer already searched for a newline
+        self._scanned = 0
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """
+        Add data read from the pipe
+
+        Args:
+            data: Bytes as read from the backend's stdout
+
+        Returns:
+            The messages completed by this data, in order
+        """
+        buffer = self._buffer
+        buffer.extend(data)
+        frames: list[bytes] = []
+        start = 0
+        newline = buffer.find(b"\n", self._scanned)
+        while newline >= 0:
+            line = bytes(buffer[start:newline]).strip()
+            if line:
+                frames.append(line)
+            start = newline + 1
+            newline = buffer.find(b"\n", start)
+        # Drop the completed lines at once; the rest has been searched already
+        del buffer[:start]
+        self._scanned = len(buffer)
+        return frames
+
+
+class PersistentMCPSession:
+    """
+    Long-lived `docker exec` stdio session with one backend MCP server
+
+    The initialize handshake runs once when the process starts; afterwards each call writes
+    one request and waits for the MCPSessionReader thread to hand back the response with the
+    same id, so several calls can be in flight on one session. The process is respawned when
+    it died or its pipe broke, and killed when a call times out.
+    """
+
+    def __init__(self, container_name: str):
+        self.container_name = container_name
+        # Guards starting/stopping the process and writing to its stdin
+        self._lock = threading.Lock()
+        self._process: subprocess.Popen[bytes] | None = None
+        self._next_id = 1
+        # Futures waiting for a response, keyed by JSON-RPC id
+        self._pending: dict[int, Future[dict[str, Any]]] = {}
+        self._pending_lock = threading.Lock()
+        # When the backend last made progress: answered, or got a request while idle
+        self._last_activity = time.monotonic()
+
+    def _start(self) -> None:
+        """Spawn the backend server and run the initialize handshake (lock held)"""
         process = subprocess.Popen(
-            ["docker", "exec", "-i", container_name, "python", "-u", "server.py"],
+            ["docker", "exec", "-i", self.container_name, "python", "-u", "server.py"],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+            # Nothing reads stderr for the lifetime of the session, so don't let it fill a pipe
+            stderr=subprocess.DEVNULL,
         )
+        if process.stdin is None or process.stdout is None:
+            raise RuntimeError(f"Failed to create process stdin/stdout for {self.container_name}")
 
-        # Send initialize request
-        init_request = (
-            json.dumps(
-                {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "initialize",
-                    "params": {
-                        "protocolVersion": "2024-11-05",
-                        "capabilities": {},
-                        "clientInfo": {"name": "agent-service", "version": "1.0.0"},
-                    },
-                }
-            )
-            + "\n"
+        self._process = process
+        _READER.register(
+            process.stdout.fileno(), functools.partial(self._on_readable, process, FrameDecoder())
         )
+        logger.info(f"Started MCP session with {self.container_name}")
 
-        if process.stdin is None or process.stdout is None:
-            raise RuntimeError(f"Failed to create process stdin/stdout for {container_name}")
-
-        process.stdin.write(init_request)
+        self._send(
+            "initialize",
+            {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "agent-service", "version": "1.0.0"},
+            },
+        ).result(timeout=MCP_CALL_TIMEOUT)
+
+    def _send(self, method: str, params: dict[str, Any] | None) -> Future[dict[str, Any]]:
+        """Write one request to the running process (lock held)"""
+        process = self._process
+        if process is None or process.stdin is None:
+            raise EOFError(f"No running process for {self.container_name}")
+
+        request_id = self._next_id
+        self._next_id += 1
+        request: dict[str, Any] = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            request["params"] = params
+
+        future: Future[dict[str, Any]] = Future()
+        with self._pending_lock:
+            if not self._pending:
+                self._last_activity = time.monotonic()
+            self._pending[request_id] = future
+
+        process.stdin.write(orjson.dumps(request, option=orjson.OPT_APPEND_NEWLINE))
         process.stdin.flush()
+        return future
 
-        # Read initialize response
-        _ = process.stdout.readline()
+    def _on_readable(self, process: subprocess.Popen[bytes], decoder: FrameDecoder) -> None:
+        """Read what the process wrote and resolve the futures of complete responses"""
+        assert process.stdout is not None
+        fd = process.stdout.fileno()
+        try:
+            chunk = os.read(fd, 65536)
+        except BlockingIOError:
+            return
 
-        # Send tools/list request
-        tools_request = json.dumps({"jsonrpc": "2.0", "id": 2, "method": "tools/list"}) + "\n"
+        if not chunk:
+            _READER.unregister(fd)
+            if self._process is process:
+                self._fail_pending(EOFError(f"{self.container_name} closed its stdout"))
+            return
 
-        process.stdin.write(tools_request)
-        process.stdin.flush()
+        for frame in decoder.feed(chunk):
+            try:
+                response = orjson.loads(frame)
+            except orjson.JSONDecodeError:
+                logger.warning(f"Ignoring invalid output from {self.container_name}: {frame[:200]}")
+                continue
+            with self._pending_lock:
+                self._last_activity = time.monotonic()
+                future = self._pending.pop(response.get("id"), None)
+            if future is not None:
+                future.set_result(response)
+
+    def _fail_pending(self, error: Exception) -> None:
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def _stop(self, process: subprocess.Popen[bytes] | None, error: Exception) -> None:
+        """Kill process if it is still the session's current one (lock held)"""
+        if process is None or process is not self._process:
+            return
+        self._process = None
+        if process.stdout is not None:
+            _READER.unregister(process.stdout.fileno())
+        if process.poll() is None:
+            process.kill()
+        # Close the pipes now rather than leaving their descriptors to the garbage collector
+        for pipe in (process.stdin, process.stdout):
+            if pipe is not None:
+                with contextlib.suppress(OSError):
+                    pipe.close()
+        process.wait()
+        self._fail_pending(error)
+
+    def reap(self) -> None:
+        """Kill the process if it exited or has left requests unanswered for too long"""
+        # Skip sessions that are busy starting up; their caller enforces the timeout
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            process = self._process
+            if process is None:
+                return
+            if process.poll() is not None:
+                logger.warning(
+                    f"MCP session with {self.container_name} exited with code "
+                    f"{process.returncode}, dropping it"
+                )
+                self._stop(process, EOFError(f"{self.container_name} exited"))
+                return
+            with self._pending_lock:
+                stalled = bool(self._pending) and (
+                    time.monotonic() - self._last_activity > MCP_CALL_TIMEOUT
+                )
+            if stalled:
+                logger.warning(
+                    f"MCP session with {self.container_name} stopped answering for "
+                    f"{MCP_CALL_TIMEOUT:g}s, killing it"
+                )
+                self._stop(process, MCPTimeoutError(f"No response within {MCP_CALL_TIMEOUT:g}s"))
+        finally:
+            self._lock.release()
+
+    def close(self) -> None:
+        """Kill the backend process; the next call starts a fresh one"""
+        with self._lock:
+            self._stop(self._process, EOFError(f"Session with {self.container_name} closed"))
+
+    def call(self, method: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        """
+        Send a JSON-RPC request over the session
+
+        Args:
+            method: JSON-RPC method name
+            params: JSON-RPC params (omitted from the request when None)
+
+        Returns:
+            The full JSON-RPC response
+
+        Raises:
+            MCPTimeoutError: If the backend stalls; the process is killed before raising
+        """
+        for attempt in range(2):
+            process = None
+            try:
+                with self._lock:
+                    if self._process is None or self._process.poll() is not None:
+                        self._stop(self._process, EOFError(f"{self.container_name} exited"))
+                        self._start()
+                    process = self._process
+                    future = self._send(method, params)
+                return future.result(timeout=MCP_CALL_TIMEOUT)
+            except TimeoutError:
+                error = MCPTimeoutError(f"No response within {MCP_CALL_TIMEOUT:g}s")
+                # A stalled backend would otherwise linger; don't wait for it to recover
+                with self._lock:
+                    self._stop(process or self._process, error)
+                raise error from None
+            except (BrokenPipeError, EOFError):
+                with self._lock:
+                    self._stop(process or self._process, EOFError("Session broke"))
+                if attempt:
+                    raise
+                logger.warning(f"MCP session with {self.container_name} broke, respawning")
+        raise RuntimeError(f"Could not reach {self.container_name}")
+
+
+# Persistent stdio sessions with the backend containers, keyed by container name
+_SESSIONS: dict[str, PersistentMCPSession] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+# Background thread dropping sessions whose backend exited or hangs, started with the first one
+_REAPER: threading.Thread | None = None
+SESSION_REAP_INTERVAL = 1.0
+
+
+def get_session(container_name: str) -> PersistentMCPSession:
+    """
+    Get the persistent MCP session for a backend container, creating it on first use
+
+    Args:
+        container_name: Name of the Docker container
+
+    Returns:
+        The session for that container
+    """
+    global _REAPER
+
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(container_name)
+        if session is None:
+            session = _SESSIONS[container_name] = PersistentMCPSession(container_name)
+        if _REAPER is None:
+            _REAPER = threading.Thread(target=reap_sessions, name="mcp-reaper", daemon=True)
+            _REAPER.start()
+        return session
+
+
+def reap_sessions() -> None:
+    """Check all sessions every SESSION_REAP_INTERVAL seconds for dead or hung backends"""
+    while True:
+        time.sleep(SESSION_REAP_INTERVAL)
+        with _SESSIONS_LOCK:
+            sessions = list(_SESSIONS.values())
+        for session in sessions:
+            try:
+                session.reap()
+            except Exception as e:
+                logger.exception(f"Error checking MCP session {session.container_name}: {e}")
+
+
+def close_sessions() -> None:
+    """Stop all backend processes started by the persistent sessions"""
+    with _SESSIONS_LOCK:
+        for session in _SESSIONS.values():
+            session.close()
+        _SESSIONS.clear()
+
+
+atexit.register(close_sessions)
+
+
+def discover_tools_from_service(container_name: str) -> list[dict[str, Any]]:
+    """
+    Discover available tools from an MCP service using tools/list
 
-        # Read tools/list response
-        tools_response = process.stdout.readline()
+    Args:
+        container_name: Name of the Docker container
 
-        # Close the process
-        process.stdin.close()
-        process.terminate()
+    Returns:
+        List of tool definitions
+    """
+    try:
+        if MCP_TRANSPORT == "inprocess":
+            response_data = call_in_process(container_name, "tools/list", {})
+        else:
+            response_data = get_session(container_name).call("tools/list")
 
         # Parse and return the tools
-        response_data = json.loads(tools_response)
         tools = response_data.get("result", {}).get("tools", [])
 
         return tools
@@ -219,32 +662,90 @@ def discover_tools_from_service(container_name: str) -> list[dict[str, Any]]:
         return []
 
 
-def get_backend_tools() -> list[dict[str, Any]]:
+def services_hash() -> str:
+    """Fingerprint of MCP_SERVICES, used to invalidate the tools snapshot on config changes"""
+    return hashlib.sha256(json.dumps(MCP_SERVICES, sort_keys=True).encode()).hexdigest()
+
+
+def load_tools_snapshot() -> dict[str, dict[str, Any]] | None:
     """
-    Get backend tools, discovering them dynamically if not cached
+    Load the discovered backend tools from the on-disk snapshot
 
     Returns:
-        List of tool definitions for Claude
+        The cached tools per service, or None if there is no fresh snapshot
     """
-    global _BACKEND_TOOLS_CACHE
+    if TOOLS_CACHE_TTL <= 0:
+        return None
 
-    if _BACKEND_TOOLS_CACHE is not None:
-        # Return just the wrapper tools for OpenAI
-        return [
-            cache_entry["wrapper_tool"]
-            for cache_entry in _BACKEND_TOOLS_CACHE.values()
-            if "wrapper_tool" in cache_entry
-        ]
+    try:
+        with open(TOOLS_CACHE_PATH) as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if snapshot.get("services_hash") != services_hash():
+        logger.info("Ignoring tools snapshot: MCP service configuration changed")
+        return None
+
+    if snapshot.get("timestamp", 0) + TOOLS_CACHE_TTL < time.time():
+        logger.info("Ignoring tools snapshot: snapshot expired")
+        return None
+
+    return snapshot.get("services")
+
+
+def save_tools_snapshot(backend_tools_cache: dict[str, dict[str, Any]]) -> None:
+    """
+    Atomically write the discovered backend tools to the on-disk snapshot
+
+    Args:
+        backend_tools_cache: Discovered tools per service
+    """
+    if TOOLS_CACHE_TTL <= 0:
+        return
+
+    snapshot = {
+        "timestamp": time.time(),
+        "services_hash": services_hash(),
+        "services": backend_tools_cache,
+    }
+    tmp_path = f"{TOOLS_CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, TOOLS_CACHE_PATH)
+    except OSError as e:
+        logger.warning(f"Could not write tools snapshot to {TOOLS_CACHE_PATH}: {e}")
+
+
+def load_backend_tools() -> dict[str, dict[str, Any]]:
+    """
+    Load the backend tools from the disk snapshot, or discover them from the services
+
+    Returns:
+        Tools cache entries keyed by service name (see _BACKEND_TOOLS_CACHE)
+    """
+    snapshot = load_tools_snapshot()
+    if snapshot is not None:
+        logger.info(f"Loaded tools for {list(snapshot)} from {TOOLS_CACHE_PATH}")
+        return snapshot
 
     backend_tools_cache = {}
 
-    for service_name, service_info in MCP_SERVICES.items():
+    # Discover tools from all services at once; map() keeps MCP_SERVICES order so the
+    # wrapper tools are always listed to the model in the same order
+    with ThreadPoolExecutor(max_workers=len(MCP_SERVICES)) as executor:
+        discoveries = executor.map(
+            discover_tools_from_service,
+            [service_info["container"] for service_info in MCP_SERVICES.values()],
+        )
+
+    for (service_name, service_info), discovered_tools in zip(
+        MCP_SERVICES.items(), discoveries, strict=True
+    ):
         container = service_info["container"]
         service_desc = service_info["description"]
 
-        # Discover tools from the service
-        discovered_tools = discover_tools_from_service(container)
-
         if not discovered_tools:
             logger.warning(f"No tools discovered from {service_name}")
             continue
@@ -305,8 +806,44 @@ def get_backend_tools() -> list[dict[str, Any]]:
 
         logger.info(f"Discovered {len(tool_names)} tools from {service_name}: {tool_names}")
 
-    _BACKEND_TOOLS_CACHE = backend_tools_cache
-    return [cache_entry["wrapper_tool"] for cache_entry in backend_tools_cache.values()]
+    # Only persist complete discoveries, a service that was down should be retried next time
+    if len(backend_tools_cache) == len(MCP_SERVICES):
+        save_tools_snapshot(backend_tools_cache)
+
+    return backend_tools_cache
+
+
+def get_backend_tools() -> list[dict[str, Any]]:
+    """
+    Get backend tools, discovering them dynamically if not cached
+
+    Returns:
+        List of tool definitions for Claude
+    """
+    global _BACKEND_TOOLS_CACHE, _OPENAI_TOOLS_CACHE, _ARG_BUILDERS
+
+    if _BACKEND_TOOLS_CACHE is None:
+        with _BACKEND_TOOLS_LOCK:
+            # Another request may have finished discovery while this one waited
+            if _BACKEND_TOOLS_CACHE is None:
+                backend_tools_cache = load_backend_tools()
+                _ARG_BUILDERS = {
+                    (service_name, tool["name"]): argument_builder(tool)
+                    for service_name, cache_entry in backend_tools_cache.items()
+                    for tool in cache_entry["discovered_tools"]
+                }
+                _OPENAI_TOOLS_CACHE = convert_tools_to_openai_format(
+                    [cache_entry["wrapper_tool"] for cache_entry in backend_tools_cache.values()]
+                )
+                _BACKEND_TOOLS_CACHE = backend_tools_cache
+
+    # Return just the wrapper tools for OpenAI
+    assert _BACKEND_TOOLS_CACHE is not None
+    return [
+        cache_entry["wrapper_tool"]
+        for cache_entry in _BACKEND_TOOLS_CACHE.values()
+        if "wrapper_tool" in cache_entry
+    ]
 
 
 def call_mcp_service(
@@ -323,72 +860,27 @@ def call_mcp_service(
     Returns:
         The result from the MCP service
     """
-    logger.debug(f"Calling MCP service {service_name}, tool={tool_name}, args={arguments}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Calling MCP service {service_name}, tool={tool_name}, args={arguments}")
     try:
-        # Start the MCP server container and communicate via stdio
-        process = subprocess.Popen(
-            ["docker", "exec", "-i", service_name, "python", "-u", "server.py"],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-
-        # Send initialize request
-        init_request = (
-            json.dumps(
-                {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "initialize",
-                    "params": {
-                        "protocolVersion": "2024-11-05",
-                        "capabilities": {},
-                        "clientInfo": {"name": "agent-service", "version": "1.0.0"},
-                    },
-                }
-            )
-            + "\n"
-        )
-
-        if process.stdin is None or process.stdout is None:
-            raise RuntimeError(f"Failed to create process stdin/stdout for {service_name}")
-
-        process.stdin.write(init_request)
-        process.stdin.flush()
-
-        # Read initialize response
-        _ = process.stdout.readline()
-
-        # Send tool call request
-        tool_request = (
-            json.dumps(
-                {
-                    "jsonrpc": "2.0",
-                    "id": 2,
-                    "method": "tools/call",
-                    "params": {"name": tool_name, "arguments": arguments},
-                }
-            )
-            + "\n"
-        )
-
-        process.stdin.write(tool_request)
-        process.stdin.flush()
-
-        # Read tool response
-        tool_response = process.stdout.readline()
-
-        # Close the process
-        process.stdin.close()
-        process.terminate()
+        params = {"name": tool_name, "arguments": arguments}
+        if MCP_TRANSPORT == "inprocess":
+            response_data = call_in_process(service_name, "tools/call", params)
+        else:
+            response_data = get_session(service_name).call("tools/call", params)
 
         # Parse and return the result
-        response_data = json.loads(tool_response)
         result = response_data.get("result", {})
-        logger.debug(f"MCP service {service_name} returned: {json.dumps(result, indent=2)[:500]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            pretty = json.dumps(result, indent=2)[:500]
+            logger.debug(f"MCP service {service_name} returned: {pretty}")
         return result
 
+    except MCPTimeoutError as e:
+        # Surface the stall as a tool error so the model can retry or answer without it
+        logger.warning(f"MCP service {service_name} timed out calling {tool_name}: {e}")
+        return {"error": f"{service_name} did not respond in time ({e})"}
+
     except Exception as e:
         logger.error(f"Error calling MCP service {service_name}: {e}")
         return {"error": str(e)}
@@ -404,9 +896,8 @@ def convert_tools_to_openai_format(tools: list[dict[str, Any]]) -> list[ChatComp
     Returns:
         List of tools in OpenAI format
     """
-    openai_tools: list[ChatCompletionToolParam] = []
-    for tool in tools:
-        openai_tool = cast(
+    return [
+        cast(
             ChatCompletionToolParam,
             {
                 "type": "function",
@@ -417,8 +908,22 @@ def convert_tools_to_openai_format(tools: list[dict[str, Any]]) -> list[ChatComp
                 },
             },
         )
-        openai_tools.append(openai_tool)
-    return openai_tools
+        for tool in tools
+    ]
+
+
+def get_openai_tools() -> list[ChatCompletionToolParam]:
+    """
+    Get the backend wrapper tools in OpenAI format
+
+    The conversion happens once, when the tools are loaded; this only hands out that list.
+
+    Returns:
+        List of tools in OpenAI format
+    """
+    get_backend_tools()
+    assert _OPENAI_TOOLS_CACHE is not None
+    return _OPENAI_TOOLS_CACHE
 
 
 def build_tool_arguments(mcp_tool: str, tool_input: dict[str, Any]) -> dict[str, Any]:
@@ -432,8 +937,6 @@ def build_tool_arguments(mcp_tool: str, tool_input: dict[str, Any]) -> dict[str,
     Returns:
         Dictionary of arguments to pass to the MCP tool
     """
-    arguments: dict[str, Any] = {}
-
     # Discovery tools use 'query' parameter
     # - BAG: find_address
     # - BGT: find_area
@@ -443,19 +946,102 @@ def build_tool_arguments(mcp_tool: str, tool_input: dict[str, Any]) -> dict[str,
     discovery_tools = {"find_location", "find_address", "find_area", "find_place"}
 
     if mcp_tool in discovery_tools:
-        if "query" in tool_input:
-            arguments["query"] = tool_input["query"]
-        else:
-            # Fallback: if no query but location_id is provided, use it as query
-            # This helps if the AI model gets confused
-            if "location_id" in tool_input:
-                arguments["query"] = tool_input["location_id"]
-    else:
-        # All other tools use 'location_id' parameter
-        if "location_id" in tool_input:
-            arguments["location_id"] = tool_input["location_id"]
+        return _query_arguments(tool_input)
+    # All other tools use 'location_id' parameter
+    return _location_arguments(tool_input)
+
+
+# find_* results shared across questions, keyed by (service, tool, lowercased query)
+DISCOVERY_CACHE_TTL = float(os.environ.get("AGENT_DISCOVERY_CACHE_TTL", "3600"))
+DISCOVERY_CACHE_SIZE = 2048
+_DISCOVERY_CACHE: OrderedDict[tuple[str, str, str], tuple[float, dict[str, Any]]] = OrderedDict()
+_DISCOVERY_CACHE_LOCK = threading.Lock()
+
+
+def get_cached_discovery(key: tuple[str, str, str]) -> dict[str, Any] | None:
+    """
+    Look up a cached find_* result
+
+    Args:
+        key: (service name, tool name, lowercased query)
+
+    Returns:
+        The cached result, or None when missing or older than DISCOVERY_CACHE_TTL
+    """
+    with _DISCOVERY_CACHE_LOCK:
+        entry = _DISCOVERY_CACHE.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > DISCOVERY_CACHE_TTL:
+            del _DISCOVERY_CACHE[key]
+            return None
+        _DISCOVERY_CACHE.move_to_end(key)
+        return result
+
+
+def cache_discovery(key: tuple[str, str, str], result: dict[str, Any]) -> None:
+    """Store a successful find_* result, evicting the least recently used one when full"""
+    if DISCOVERY_CACHE_TTL <= 0:
+        return
+    with _DISCOVERY_CACHE_LOCK:
+        _DISCOVERY_CACHE[key] = (time.monotonic(), result)
+        _DISCOVERY_CACHE.move_to_end(key)
+        while len(_DISCOVERY_CACHE) > DISCOVERY_CACHE_SIZE:
+            _DISCOVERY_CACHE.popitem(last=False)
+
+
+def invalidate_discovery_cache(service_name: str | None = None) -> None:
+    """Drop the cached find_* results of one service, or of all services when None"""
+    with _DISCOVERY_CACHE_LOCK:
+        if service_name is None:
+            _DISCOVERY_CACHE.clear()
+            return
+        for key in [key for key in _DISCOVERY_CACHE if key[0] == service_name]:
+            del _DISCOVERY_CACHE[key]
 
-    return arguments
+
+def _query_arguments(tool_input: dict[str, Any]) -> dict[str, Any]:
+    """Arguments for discovery tools, which take a search query"""
+    if "query" in tool_input:
+        return {"query": tool_input["query"]}
+    # Fallback: if no query but location_id is provided, use it as query
+    # This helps if the AI model gets confused
+    if "location_id" in tool_input:
+        return {"query": tool_input["location_id"]}
+    return {}
+
+
+def _location_arguments(tool_input: dict[str, Any]) -> dict[str, Any]:
+    """Arguments for tools that look up data by location_id"""
+    if "location_id" in tool_input:
+        return {"location_id": tool_input["location_id"]}
+    return {}
+
+
+def _no_arguments(tool_input: dict[str, Any]) -> dict[str, Any]:
+    """Arguments for tools without parameters, such as the list_* tools"""
+    return {}
+
+
+def argument_builder(tool: dict[str, Any]) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    """
+    Pick the function that builds a backend tool's arguments from the model's tool input
+
+    Args:
+        tool: MCP tool definition as returned by tools/list
+
+    Returns:
+        Function mapping the wrapper tool input to the backend tool arguments
+    """
+    properties = tool.get("inputSchema", {}).get("properties", {})
+    if "query" in properties:
+        return _query_arguments
+    if "location_id" in properties:
+        return _location_arguments
+    if not properties:
+        return _no_arguments
+    return functools.partial(build_tool_arguments, tool["name"])
 
 
 def execute_backend_tool(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
@@ -464,7 +1050,10 @@ def execute_backend_tool(tool_name: str, tool_input: dict[str, Any]) -> dict[str
     # Ensure cache is populated
     get_backend_tools()
 
-    logger.debug(f"execute_backend_tool called with tool_name={tool_name}, tool_input={tool_input}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"execute_backend_tool called with tool_name={tool_name}, tool_input={tool_input}"
+        )
 
     # Handle case where OpenAI might concatenate service.tool names
     if "." in tool_name and (_BACKEND_TOOLS_CACHE is None or tool_name not in _BACKEND_TOOLS_CACHE):
@@ -479,7 +1068,6 @@ def execute_backend_tool(tool_name: str, tool_input: dict[str, Any]) -> dict[str
 
         cache_entry = _BACKEND_TOOLS_CACHE[service_name]
         container_name = cache_entry["container"]
-        arguments = build_tool_arguments(mcp_tool, tool_input)
 
     else:
         # Standard wrapper tool format
@@ -492,17 +1080,486 @@ def execute_backend_tool(tool_name: str, tool_input: dict[str, Any]) -> dict[str
         if "tool" not in tool_input:
             return {"error": f"Missing 'tool' parameter in tool_input: {tool_input}"}
 
+        service_name = tool_name
         mcp_tool = tool_input["tool"]
+
+    # Tools the services didn't report (e.g. made up by the model) take the generic path
+    builder = _ARG_BUILDERS.get((service_name, mcp_tool))
+    if builder is not None:
+        arguments = builder(tool_input)
+    else:
         arguments = build_tool_arguments(mcp_tool, tool_input)
 
+    # Discovery results are shared across questions: the same city gets looked up a lot
+    discovery_key = None
+    if builder is _query_arguments and isinstance(arguments.get("query"), str):
+        # The backends match queries case-insensitively
+        discovery_key = (service_name, mcp_tool, arguments["query"].lower())
+        cached = get_cached_discovery(discovery_key)
+        if cached is not None:
+            logger.info(f"Answering {service_name} > {mcp_tool} from the discovery cache")
+            return cached
+
     logger.info(f"Calling {container_name} > {mcp_tool} with arguments: {arguments}")
 
     # Call the backend MCP service
     result = call_mcp_service(container_name, mcp_tool, arguments)
 
+    if "error" in result:
+        # The service misbehaves, don't keep answering from what it said before
+        invalidate_discovery_cache(service_name)
+    elif discovery_key is not None and not result.get("isError"):
+        cache_discovery(discovery_key, result)
+
+    return result
+
+
+# Keys in backend JSON-LD payloads that carry no information for answering questions
+_DROPPED_RESULT_KEYS = frozenset({"@context"})
+
+# Lists in tool results are cut down to this many items, followed by a count of the rest
+MAX_RESULT_LIST_ITEMS = 25
+
+# Tool results are trimmed to at most this many bytes of JSON before entering the conversation
+MAX_TOOL_RESULT_BYTES = 4096
+
+
+def _compact(value: Any) -> Any:
+    """Recursively drop keys the model does not need and summarize long lists"""
+    if isinstance(value, dict):
+        return {
+            key: _compact(item) for key, item in value.items() if key not in _DROPPED_RESULT_KEYS
+        }
+    if isinstance(value, list):
+        items = [_compact(item) for item in value[:MAX_RESULT_LIST_ITEMS]]
+        if len(value) > MAX_RESULT_LIST_ITEMS:
+            items.append({"omittedItems": len(value) - MAX_RESULT_LIST_ITEMS})
+        return items
+    return value
+
+
+def _decode_content_item(item: Any) -> Any:
+    """Decode the JSON-LD document carried in an MCP text content item, if it is one"""
+    if isinstance(item, dict) and item.get("type") == "text":
+        text = item.get("text")
+        try:
+            return orjson.loads(text)
+        except (TypeError, ValueError):
+            return text
+    return item
+
+
+def _truncate_graphs(value: Any, keep: int) -> Any:
+    """Keep the first `keep` nodes of every JSON-LD @graph, followed by a count of the rest"""
+    if isinstance(value, list):
+        return [_truncate_graphs(item, keep) for item in value]
+    if not isinstance(value, dict):
+        return value
+    truncated = {key: _truncate_graphs(item, keep) for key, item in value.items()}
+    graph = truncated.get("@graph")
+    if isinstance(graph, list) and len(graph) > keep:
+        truncated["@graph"] = [*graph[:keep], {"truncated": len(graph) - keep}]
+    return truncated
+
+
+def compact_tool_result(result: dict[str, Any], limit: int = MAX_TOOL_RESULT_BYTES) -> str:
+    """
+    Serialize a backend tool result for the conversation using as few tokens as possible
+
+    Args:
+        result: MCP tool result (or error dict) returned by execute_backend_tool
+        limit: Maximum size of the serialized result in bytes
+
+    Returns:
+        Whitespace-free JSON with the embedded JSON-LD decoded and compacted, with @graph
+        lists shortened (and as a last resort the text cut off) to stay within limit
+    """
+    content = result.get("content")
+    if isinstance(content, list):
+        result = {**result, "content": [_decode_content_item(item) for item in content]}
+
+    text = orjson.dumps(_compact(result))
+    keep = MAX_RESULT_LIST_ITEMS
+    while len(text) > limit and keep > 1:
+        keep //= 2
+        text = orjson.dumps(_compact(_truncate_graphs(result, keep)))
+
+    if len(text) > limit:
+        # Even a single node is too large, cut the JSON text itself
+        return text[:limit].decode(errors="ignore") + "...[truncated]"
+    return text.decode()
+
+
+@dataclass(slots=True, frozen=True)
+class ToolCall:
+    """A function call requested by the model, detached from the OpenAI SDK objects"""
+
+    id: str
+    name: str
+    arguments: str
+    input: dict[str, Any]
+
+    def cache_key(self) -> str:
+        """Key identifying the backend call, independent of argument order and call id"""
+        canonical = orjson.dumps([self.name, self.input], option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha1(canonical).hexdigest()
+
+    def to_param(self) -> ChatCompletionMessageToolCallParam:
+        """Build the tool call entry for the assistant message sent back to the API"""
+        return {
+            "id": self.id,
+            "type": "function",
+            "function": {"name": self.name, "arguments": self.arguments},
+        }
+
+
+def assistant_message_param(
+    message: Any, tool_calls: list[ToolCall]
+) -> ChatCompletionAssistantMessageParam:
+    """
+    Turn the model's tool-calling message into the assistant entry for the conversation
+
+    Args:
+        message: The ChatCompletionMessage returned by the API
+        tool_calls: The function calls read from that message
+
+    Returns:
+        The assistant message to append to messages
+    """
+    # The SDK's own dump already has the right shape; only rebuild it when it can't be used
+    # as is (older SDKs without model_dump, or tool calls that aren't function calls)
+    if hasattr(message, "model_dump") and len(tool_calls) == len(message.tool_calls):
+        return cast(
+            ChatCompletionAssistantMessageParam,
+            message.model_dump(
+                mode="json", include={"role", "content", "tool_calls"}, exclude_none=True
+            ),
+        )
+    return {
+        "role": "assistant",
+        "tool_calls": [tool_call.to_param() for tool_call in tool_calls],
+    }
+
+
+# Upper bound on backend tool calls from one model turn that run at the same time
+MAX_PARALLEL_TOOL_CALLS = 8
+
+# The same failing tool call this many times makes the model answer without more tools
+MAX_REPEATED_FAILURES = 3
+
+# Total OpenAI tokens (prompt + completion, all iterations) one question may use; <= 0 disables
+AGENT_TOKEN_BUDGET = int(os.environ.get("AGENT_TOKEN_BUDGET", "200000"))
+
+
+def run_tool_call(tool_call: ToolCall) -> dict[str, Any]:
+    """
+    Execute one tool call requested by the model
+
+    Args:
+        tool_call: The function call from the model's message
+
+    Returns:
+        The backend result (contains "error" when the call failed)
+    """
+    tool_name = tool_call.name
+    tool_input = tool_call.input
+
+    logger.info(f"Executing tool: {tool_name} with input: {tool_input}")
+
+    # Execute the tool
+    result = execute_backend_tool(tool_name, tool_input)
+
+    # Log the result
+    if "error" in result:
+        logger.error(f"Tool {tool_name} returned error: {result['error']}")
+    else:
+        logger.info(f"Tool {tool_name} completed successfully")
+
     return result
 
 
+def run_tool_calls(tool_calls: list[ToolCall]) -> list[dict[str, Any]]:
+    """
+    Execute tool calls concurrently
+
+    Args:
+        tool_calls: The function calls to execute
+
+    Returns:
+        The backend results, in call order
+    """
+    if len(tool_calls) <= 1:
+        return [run_tool_call(tool_call) for tool_call in tool_calls]
+    with ThreadPoolExecutor(max_workers=min(len(tool_calls), MAX_PARALLEL_TOOL_CALLS)) as executor:
+        return list(executor.map(run_tool_call, tool_calls))
+
+
+# Plan all tool calls of a question in one OpenAI call before the iterative loop (default off)
+AGENT_PLANNER = os.environ.get("AGENT_PLANNER", "0").lower() in ("1", "true", "yes")
+
+# Upper bound on the tool calls one plan may contain
+MAX_PLAN_STEPS = 16
+
+PLANNER_PROMPT = (
+    "You plan the tool calls needed to answer a question about Dutch locations.\n"
+    "Available services and their tools:\n{catalog}\n\n"
+    "Output a JSON DAG of tool calls to answer this, as a JSON object:\n"
+    '{{"steps": [{{"id": "s1", "service": "CBS", "tool": "find_location", '
+    '"query": "Amsterdam"}}, '
+    '{{"id": "s2", "service": "CBS", "tool": "get_statistics", "location_id": "$s1"}}]}}\n'
+    "Rules:\n"
+    '- find_* tools take a "query"; tools about one location take a "location_id" '
+    'that MUST reference an earlier find step as "$<step id>", never a literal ID\n'
+    "- Tools without arguments take neither\n"
+    "- Only plan calls whose arguments are known up front\n"
+    '- Output {{"steps": []}} if the question cannot be planned this way'
+)
+
+
+@dataclass(slots=True, frozen=True)
+class ToolCallNode:
+    """One backend call in a question plan"""
+
+    id: str
+    service: str
+    tool: str
+    query: str | None
+    # Id of the find step whose location this call is about
+    depends_on: str | None
+    # Number of calls this one waits for; calls on the same level run together
+    level: int
+
+
+def _plan_catalog() -> str:
+    """List every service with its backend tools for the planner prompt"""
+    get_backend_tools()
+    assert _BACKEND_TOOLS_CACHE is not None
+    return "\n".join(
+        f"- {service_name}: " + ", ".join(tool["name"] for tool in cache_entry["discovered_tools"])
+        for service_name, cache_entry in _BACKEND_TOOLS_CACHE.items()
+    )
+
+
+def parse_plan(content: str) -> list[ToolCallNode]:
+    """
+    Parse and topologically sort the plan returned by the model
+
+    Args:
+        content: The model's JSON reply
+
+    Returns:
+        The plan's calls, ordered by level
+
+    Raises:
+        ValueError: If the reply is not a valid plan
+    """
+    steps = orjson.loads(content).get("steps")
+    if not isinstance(steps, list) or len(steps) > MAX_PLAN_STEPS:
+        raise ValueError("plan has no valid steps list")
+
+    assert _BACKEND_TOOLS_CACHE is not None
+    parsed: dict[str, tuple[str, str, str | None, str | None]] = {}
+    for step in steps:
+        step_id, service, tool = step.get("id"), step.get("service"), step.get("tool")
+        if not isinstance(step_id, str) or step_id in parsed:
+            raise ValueError(f"invalid or duplicate step id: {step_id!r}")
+        cache_entry = _BACKEND_TOOLS_CACHE.get(service)
+        if cache_entry is None or not any(
+            t["name"] == tool for t in cache_entry["discovered_tools"]
+        ):
+            raise ValueError(f"unknown tool {service}.{tool} in step {step_id}")
+        query = step.get("query")
+        location_id = step.get("location_id")
+        if location_id is not None and not (
+            isinstance(location_id, str) and location_id.startswith("$")
+        ):
+            raise ValueError(f"step {step_id} does not reference a find step")
+        parsed[step_id] = (
+            service,
+            tool,
+            query if isinstance(query, str) else None,
+            location_id[1:] if location_id else None,
+        )
+
+    # Kahn's algorithm; every call depends on at most one find step
+    levels: dict[str, int] = {}
+    remaining = dict(parsed)
+    level = 0
+    while remaining:
+        ready = [
+            step_id
+            for step_id, (_, _, _, depends_on) in remaining.items()
+            if depends_on is None or depends_on in levels
+        ]
+        if not ready:
+            raise ValueError(f"unresolvable or cyclic references in steps {sorted(remaining)}")
+        for step_id in ready:
+            levels[step_id] = level
+            del remaining[step_id]
+        level += 1
+
+    return sorted(
+        (
+            ToolCallNode(step_id, service, tool, query, depends_on, levels[step_id])
+            for step_id, (service, tool, query, depends_on) in parsed.items()
+        ),
+        key=lambda node: node.level,
+    )
+
+
+def plan_question(question: str) -> tuple[list[ToolCallNode], int]:
+    """
+    Ask the model for all tool calls needed to answer a question
+
+    Args:
+        question: Natural language question about locations
+
+    Returns:
+        The planned calls ordered by level (empty when the question could not be planned),
+        and the tokens the planning call used
+    """
+    assert client is not None and AZURE_DEPLOYMENT
+    response = client.chat.completions.create(
+        model=AZURE_DEPLOYMENT,
+        max_tokens=1024,
+        response_format={"type": "json_object"},
+        messages=[
+            {"role": "system", "content": PLANNER_PROMPT.format(catalog=_plan_catalog())},
+            {"role": "user", "content": question},
+        ],
+    )
+    tokens = response.usage.total_tokens if response.usage is not None else 0
+
+    try:
+        plan = parse_plan(response.choices[0].message.content or "")
+    except (ValueError, AttributeError, TypeError) as e:
+        logger.warning(f"Ignoring question plan: {e}")
+        return [], tokens
+
+    logger.info(f"Planned {len(plan)} tool call(s) in {plan[-1].level + 1 if plan else 0} level(s)")
+    return plan, tokens
+
+
+def _find_location_id(value: Any) -> str | None:
+    """Return the first geo:locationId in a decoded backend result"""
+    if isinstance(value, dict):
+        location_id = value.get("geo:locationId")
+        if isinstance(location_id, str):
+            return location_id
+        value = list(value.values())
+    if isinstance(value, list):
+        for item in value:
+            location_id = _find_location_id(item)
+            if location_id is not None:
+                return location_id
+    return None
+
+
+def execute_plan(plan: list[ToolCallNode]) -> list[tuple[ToolCall, dict[str, Any]]]:
+    """
+    Execute a question plan level by level
+
+    Calls whose find step failed or found nothing are skipped; the model can still make them
+    itself once it sees the results.
+
+    Args:
+        plan: The planned calls, ordered by level
+
+    Returns:
+        Each executed call with its backend result, in plan order
+    """
+    location_ids: dict[str, str] = {}
+    executed: list[tuple[ToolCall, dict[str, Any]]] = []
+
+    for level in range(plan[-1].level + 1 if plan else 0):
+        tool_calls = []
+        for node in plan:
+            if node.level != level:
+                continue
+            tool_input: dict[str, Any] = {"tool": node.tool}
+            if node.query is not None:
+                tool_input["query"] = node.query
+            if node.depends_on is not None:
+                if node.depends_on not in location_ids:
+                    logger.info(
+                        f"Skipping planned step {node.id}: no location from {node.depends_on}"
+                    )
+                    continue
+                tool_input["location_id"] = location_ids[node.depends_on]
+            tool_calls.append(
+                ToolCall(
+                    f"plan_{node.id}",
+                    node.service,
+                    orjson.dumps(tool_input).decode(),
+                    tool_input,
+                )
+            )
+
+        for tool_call, result in zip(tool_calls, run_tool_calls(tool_calls), strict=True):
+            executed.append((tool_call, result))
+            if "error" not in result and not result.get("isError"):
+                location_id = _find_location_id(
+                    [_decode_content_item(item) for item in result.get("content", [])]
+                )
+                if location_id is not None:
+                    location_ids[tool_call.id.removeprefix("plan_")] = location_id
+
+    return executed
+
+
+# System prompt for ask_question; built once at import
+SYSTEM_PROMPT = (
+    "You are an expert assistant with access to Dutch geospatial data "
+    "from five government data sources:\n"
+    "- BAG (Addresses & Buildings): Street addresses, postal codes, building "
+    "purposes, construction years, floor areas\n"
+    "- BGT (Large-Scale Topography): Road types, surfaces, cycleways, water "
+    "features, terrain classification\n"
+    "- BRT (Topographic Maps): Geographic names, neighborhoods, provinces, "
+    "water boards, safety regions, parks, forests\n"
+    "- CBS (Statistics Netherlands): Demographics, population, income, "
+    "unemployment rates\n"
+    "- Rijkswaterstaat (Infrastructure & Water): Highways, bridges, tunnels, "
+    "canals, water levels\n\n"
+    "LOCATION DISCOVERY WORKFLOW (MANDATORY):\n"
+    "When a user asks about a location (city, address, etc.), you MUST:\n"
+    "1. FIRST call a find tool (find_address in BAG, find_location in CBS/RWS, "
+    "find_area in BGT, find_place in BRT) to get the location ID\n"
+    "   Example: To find Amsterdam, call the BAG tool with "
+    '{"tool": "find_address", "query": "Amsterdam"}\n'
+    "2. Extract the locationId from the response (e.g., 'LOC001')\n"
+    "3. THEN use that locationId with other tools to get detailed data\n"
+    "   Example: Call CBS with "
+    '{"tool": "get_statistics", "location_id": "LOC001"}\n\n'
+    "Each service has its own discovery tool that returns location IDs.\n"
+    "The locationId is SHARED across all services - LOC001 in BAG refers "
+    "to the same place as LOC001 in CBS, BGT, BRT, and Rijkswaterstaat.\n\n"
+    "CRITICAL RULES:\n"
+    "1. You MUST use find_location FIRST to discover location IDs\n"
+    "2. You MUST NOT assume or hardcode location IDs\n"
+    "3. You MUST use the available tools to gather all information\n"
+    "4. You MUST NOT make guesses or use general knowledge to answer questions\n"
+    "5. You MUST ONLY answer based on data returned from the tools\n"
+    "6. If a tool call fails or returns an error, inform the user that the "
+    "data is unavailable\n"
+    "7. If you cannot get data from the tools, say so explicitly - do NOT "
+    "provide approximations or guesses\n"
+    '8. NEVER use phrases like "approximately", "based on latest data", '
+    '"prior to", or "around" unless that data came from a tool\n'
+    "9. If tools don't return data, respond with: "
+    '"I was unable to retrieve that information from the available data sources."\n\n'
+    "CITATION REQUIREMENTS:\n"
+    "10. For EACH piece of information in your answer, you MUST cite the "
+    "source tool that provided it\n"
+    '11. Use this format: "- **Field Name**: Value '
+    '(Source: ServiceName > tool_name)"\n'
+    '12. Example: "- **Owner**: Gemeente Amsterdam '
+    '(Source: Kadaster > get_property)"\n'
+    "13. If multiple tools provided related information, cite all relevant sources\n\n"
+    "Your answers must be based EXCLUSIVELY on tool results. No exceptions."
+)
+
+
 def ask_question(question: str) -> str:
     """
     Use Azure OpenAI to answer a question by querying backend MCP services
@@ -520,62 +1577,43 @@ def ask_question(question: str) -> str:
         return "Error: Azure OpenAI deployment name not set. Cannot use AI agent."
 
     messages: list[ChatCompletionMessageParam] = [
-        {
-            "role": "system",
-            "content": (
-                "You are an expert assistant with access to Dutch geospatial data "
-                "from five government data sources:\n"
-                "- BAG (Addresses & Buildings): Street addresses, postal codes, building "
-                "purposes, construction years, floor areas\n"
-                "- BGT (Large-Scale Topography): Road types, surfaces, cycleways, water "
-                "features, terrain classification\n"
-                "- BRT (Topographic Maps): Geographic names, neighborhoods, provinces, "
-                "water boards, safety regions, parks, forests\n"
-                "- CBS (Statistics Netherlands): Demographics, population, income, "
-                "unemployment rates\n"
-                "- Rijkswaterstaat (Infrastructure & Water): Highways, bridges, tunnels, "
-                "canals, water levels\n\n"
-                "LOCATION DISCOVERY WORKFLOW (MANDATORY):\n"
-                "When a user asks about a location (city, address, etc.), you MUST:\n"
-                "1. FIRST call a find tool (find_address in BAG, find_location in CBS/RWS, "
-                "find_area in BGT, find_place in BRT) to get the location ID\n"
-                "   Example: To find Amsterdam, call the BAG tool with "
-                '{"tool": "find_address", "query": "Amsterdam"}\n'
-                "2. Extract the locationId from the response (e.g., 'LOC001')\n"
-                "3. THEN use that locationId with other tools to get detailed data\n"
-                "   Example: Call CBS with "
-                '{"tool": "get_statistics", "location_id": "LOC001"}\n\n'
-                "Each service has its own discovery tool that returns location IDs.\n"
-                "The locationId is SHARED across all services - LOC001 in BAG refers "
-                "to the same place as LOC001 in CBS, BGT, BRT, and Rijkswaterstaat.\n\n"
-                "CRITICAL RULES:\n"
-                "1. You MUST use find_location FIRST to discover location IDs\n"
-                "2. You MUST NOT assume or hardcode location IDs\n"
-                "3. You MUST use the available tools to gather all information\n"
-                "4. You MUST NOT make guesses or use general knowledge to answer questions\n"
-                "5. You MUST ONLY answer based on data returned from the tools\n"
-                "6. If a tool call fails or returns an error, inform the user that the "
-                "data is unavailable\n"
-                "7. If you cannot get data from the tools, say so explicitly - do NOT "
-                "provide approximations or guesses\n"
-                '8. NEVER use phrases like "approximately", "based on latest data", '
-                '"prior to", or "around" unless that data came from a tool\n'
-                "9. If tools don't return data, respond with: "
-                '"I was unable to retrieve that information from the available data sources."\n\n'
-                "CITATION REQUIREMENTS:\n"
-                "10. For EACH piece of information in your answer, you MUST cite the "
-                "source tool that provided it\n"
-                '11. Use this format: "- **Field Name**: Value '
-                '(Source: ServiceName > tool_name)"\n'
-                '12. Example: "- **Owner**: Gemeente Amsterdam '
-                '(Source: Kadaster > get_property)"\n'
-                "13. If multiple tools provided related information, cite all relevant sources\n\n"
-                "Your answers must be based EXCLUSIVELY on tool results. No exceptions."
-            ),
-        },
+        {"role": "system", "content": SYSTEM_PROMPT},
         {"role": "user", "content": question},
     ]
 
+    # Successful backend results for this question, keyed by ToolCall.cache_key()
+    tool_results: dict[str, dict[str, Any]] = {}
+
+    # Failed backend calls per ToolCall.cache_key(), to stop the model retrying in circles
+    failures: Counter[str] = Counter()
+    tool_choice: Literal["auto", "none"] = "auto"
+    tokens_used = 0
+
+    # The tool set doesn't change while answering, convert it once up front
+    openai_tools = get_openai_tools()
+
+    # Run the planned calls up front; the loop below then usually only needs to answer, and
+    # falls back to regular tool calls for whatever the plan missed
+    if AGENT_PLANNER:
+        plan, tokens_used = plan_question(question)
+        executed = execute_plan(plan)
+        if executed:
+            messages.append(
+                {
+                    "role": "assistant",
+                    "tool_calls": [tool_call.to_param() for tool_call, _ in executed],
+                }
+            )
+            for tool_call, result in executed:
+                if "error" not in result and not result.get("isError"):
+                    tool_results[tool_call.cache_key()] = result
+                planned_message: ChatCompletionToolMessageParam = {
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "content": compact_tool_result(result),
+                }
+                messages.append(planned_message)
+
     max_iterations = 20
     iteration = 0
 
@@ -583,79 +1621,98 @@ def ask_question(question: str) -> str:
         iteration += 1
         logger.info(f"Agent iteration {iteration}/{max_iterations}")
 
-        # Get backend tools and convert to OpenAI format
-        backend_tools = get_backend_tools()
-        openai_tools = convert_tools_to_openai_format(backend_tools)
-
         # Call Azure OpenAI with tools
-        # Use "auto" to allow the model to decide when it has enough info to answer
+        # Use "auto" to allow the model to decide when it has enough info to answer,
+        # "none" once it got stuck on failing calls and must answer with what it has
         logger.debug(f"Calling Azure OpenAI with {len(openai_tools)} tools available")
         response = client.chat.completions.create(
             model=AZURE_DEPLOYMENT,
             max_tokens=4096,
-            tool_choice="auto",
+            tool_choice=tool_choice,
             tools=openai_tools,
             messages=messages,
         )
 
         message = response.choices[0].message
 
+        if response.usage is not None:
+            tokens_used += response.usage.total_tokens
+        if AGENT_TOKEN_BUDGET > 0 and tokens_used > AGENT_TOKEN_BUDGET and message.tool_calls:
+            logger.warning(f"Token budget of {AGENT_TOKEN_BUDGET} exhausted ({tokens_used} used)")
+            return "Token budget exhausted before the question could be answered."
+
         # Check if the model wants to use tools
         if message.tool_calls:
             logger.info(f"AI model wants to call {len(message.tool_calls)} tool(s)")
 
-            # Add assistant's message to conversation
-            tool_calls_param: list[ChatCompletionMessageToolCallParam] = []
-            for tc in message.tool_calls:
-                # Only handle function tool calls
-                if tc.type == "function" and hasattr(tc, "function"):
-                    tool_calls_param.append(
-                        cast(
-                            ChatCompletionMessageToolCallParam,
-                            {
-                                "id": tc.id,
-                                "type": "function",
-                                "function": {
-                                    "name": tc.function.name,
-                                    "arguments": tc.function.arguments,
-                                },
-                            },
-                        )
-                    )
+            # Read each function call off the SDK objects once
+            tool_calls = [
+                ToolCall(
+                    tc.id,
+                    tc.function.name,
+                    tc.function.arguments,
+                    orjson.loads(tc.function.arguments),
+                )
+                for tc in message.tool_calls
+                if tc.type == "function"
+            ]
 
-            assistant_message: ChatCompletionAssistantMessageParam = {
-                "role": "assistant",
-                "tool_calls": tool_calls_param,
+            # Add assistant's message to conversation
+            messages.append(assistant_message_param(message, tool_calls))
+
+            # Only call the backends for requests not answered earlier in this question;
+            # identical calls within the turn are sent once
+            keys = [tool_call.cache_key() for tool_call in tool_calls]
+            pending = {
+                key: tool_call
+                for key, tool_call in zip(keys, tool_calls, strict=True)
+                if key not in tool_results
             }
-            messages.append(assistant_message)
-
-            # Execute each tool call
-            for tool_call in message.tool_calls:
-                if tool_call.type == "function" and hasattr(tool_call, "function"):
-                    tool_name = tool_call.function.name
-                    tool_input = json.loads(tool_call.function.arguments)
-                else:
-                    continue
-
-                logger.info(f"Executing tool: {tool_name} with input: {tool_input}")
+            if len(pending) < len(tool_calls):
+                logger.info(f"Reusing {len(tool_calls) - len(pending)} earlier tool result(s)")
 
-                # Execute the tool
-                result = execute_backend_tool(tool_name, tool_input)
+            # Execute the tool calls concurrently; results come back in call order
+            results = run_tool_calls(list(pending.values()))
 
-                # Log the result
-                if "error" in result:
-                    logger.error(f"Tool {tool_name} returned error: {result['error']}")
-                else:
-                    logger.info(f"Tool {tool_name} completed successfully")
+            # Failed calls are answered this turn but retried if the model asks again
+            turn_results = dict(zip(pending, results, strict=True))
+            for key, result in turn_results.items():
+                if "error" not in result and not result.get("isError"):
+                    tool_results[key] = result
 
-                # Add tool result to messages
+            # Add tool results to messages
+            for tool_call, key in zip(tool_calls, keys, strict=True):
+                result = turn_results[key] if key in turn_results else tool_results[key]
                 tool_message: ChatCompletionToolMessageParam = {
                     "role": "tool",
                     "tool_call_id": tool_call.id,
-                    "content": json.dumps(result, indent=2),
+                    "content": compact_tool_result(result),
                 }
                 messages.append(tool_message)
 
+            # Count failed requests; identical calls within the turn were only sent once
+            repeated_failures = set()
+            for key in turn_results:
+                if key not in tool_results:
+                    failures[key] += 1
+                    if failures[key] >= MAX_REPEATED_FAILURES:
+                        repeated_failures.add(pending[key].name)
+
+            if repeated_failures:
+                names = ", ".join(sorted(repeated_failures))
+                logger.warning(f"Stopping tool calls after repeated failures on {names}")
+                messages.append(
+                    {
+                        "role": "system",
+                        "content": (
+                            f"Stopping: repeated failure on {names}. Do not call any more "
+                            "tools. Answer now using only the tool results above and state "
+                            "which information is unavailable."
+                        ),
+                    }
+                )
+                tool_choice = "none"
+
         elif message.content:
             # Model provided a final answer
             logger.info(f"AI model provided final answer (length: {len(message.content)} chars)")
@@ -669,6 +1726,36 @@ def ask_question(question: str) -> str:
     return "Maximum iterations reached without completing the query."
 
 
+# Questions ask_questions answers at the same time, to stay within the Azure OpenAI rate limit
+MAX_PARALLEL_QUESTIONS = int(os.environ.get("AGENT_MAX_PARALLEL_QUESTIONS", "4"))
+
+
+def ask_questions(questions: list[str]) -> list[str]:
+    """
+    Answer several independent questions concurrently
+
+    Args:
+        questions: Natural language questions about locations
+
+    Returns:
+        The answers, in the same order as the questions
+    """
+    if not questions:
+        return []
+
+    def answer(question: str) -> str:
+        try:
+            return ask_question(question)
+        except Exception as e:
+            logger.exception(f"Error processing question: {e}")
+            return f"Error: {str(e)}"
+
+    with ThreadPoolExecutor(
+        max_workers=min(len(questions), MAX_PARALLEL_QUESTIONS), thread_name_prefix="question"
+    ) as executor:
+        return list(executor.map(answer, questions))
+
+
 def handle_request(request):
     """Handle MCP JSON-RPC request"""
     method = request.get("method")
@@ -719,7 +1806,26 @@ def handle_request(request):
                             },
                             "required": ["question"],
                         },
-                    }
+                    },
+                    {
+                        "name": "ask_questions",
+                        "description": (
+                            "Ask several independent questions about Dutch locations at once. "
+                            "The questions are answered concurrently; the result holds one "
+                            "answer per question, in the same order."
+                        ),
+                        "inputSchema": {
+                            "type": "object",
+                            "properties": {
+                                "questions": {
+                                    "type": "array",
+                                    "items": {"type": "string"},
+                                    "description": "The questions to answer",
+                                }
+                            },
+                            "required": ["questions"],
+                        },
+                    },
                 ]
             },
         }
@@ -764,6 +1870,46 @@ def handle_request(request):
                     },
                 }
 
+        if tool_name == "ask_questions":
+            questions = tool_args.get("questions")
+
+            if not questions or not isinstance(questions, list):
+                logger.error("ask_questions called without a questions list")
+                return {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "result": {
+                        "content": [{"type": "text", "text": "Error: Questions are required"}],
+                        "isError": True,
+                    },
+                }
+
+            # Checked up front, a bad item would otherwise only fail inside a worker thread
+            if not all(isinstance(question, str) and question.strip() for question in questions):
+                logger.error("ask_questions called with an empty or non-string question")
+                return {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "result": {
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": "Error: Questions must be non-empty strings",
+                            }
+                        ],
+                        "isError": True,
+                    },
+                }
+
+            logger.info(f"Received {len(questions)} questions")
+            answers = ask_questions(questions)
+
+            return {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "result": {"content": [{"type": "text", "text": answer} for answer in answers]},
+            }
+
     # Unknown method
     return {
         "jsonrpc": "2.0",
@@ -772,24 +1918,106 @@ def handle_request(request):
     }
 
 
+# Longest JSON-RPC request line accepted on stdin
+MAX_REQUEST_BYTES = 1024 * 1024
+
+# Requests handled at the same time; each one may hold a thread for a whole ask_question
+MAX_CONCURRENT_REQUESTS = int(os.environ.get("AGENT_MAX_CONCURRENT_REQUESTS", "8"))
+
+
+def error_response(error: Exception) -> dict[str, Any]:
+    """Build the JSON-RPC internal error response for a request that could not be handled"""
+    return {
+        "jsonrpc": "2.0",
+        "id": None,
+        "error": {"code": -32603, "message": str(error)},
+    }
+
+
+def write_response(out: BinaryIO, response: dict[str, Any]) -> None:
+    """Write one JSON-RPC response as a single newline-terminated binary frame"""
+    out.write(orjson.dumps(response, option=orjson.OPT_APPEND_NEWLINE))
+    out.flush()
+
+
+def event_loop_factory() -> tuple[str, Callable[[], asyncio.AbstractEventLoop] | None]:
+    """
+    Pick the fastest event loop implementation that is installed
+
+    Prefers uvloop, falling back to the default asyncio selector loop.
+
+    Returns:
+        Tuple of (implementation name, loop factory or None for the default loop)
+    """
+    try:
+        import uvloop
+
+        return "uvloop", uvloop.new_event_loop
+    except ImportError:
+        return "asyncio", None
+
+
+async def serve() -> None:
+    """Read JSON-RPC requests from stdin and answer them on stdout"""
+    loop = asyncio.get_running_loop()
+    out = sys.stdout.buffer
+
+    if stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode):
+        # Regular files (e.g. `server.py < requests.jsonl`) cannot be watched by the loop
+        def readline():
+            return loop.run_in_executor(None, sys.stdin.buffer.readline)
+
+    else:
+        reader = asyncio.StreamReader(limit=MAX_REQUEST_BYTES)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer)
+        readline = reader.readline
+
+    # Requests run concurrently; keep references so the tasks aren't garbage collected
+    pending: set[asyncio.Task[None]] = set()
+    executor = ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_REQUESTS, thread_name_prefix="agent-request"
+    )
+
+    async def respond(request: Any) -> None:
+        try:
+            # handle_request blocks on Azure OpenAI and the backends, keep it off the loop
+            response = await loop.run_in_executor(executor, handle_request, request)
+        except Exception as e:
+            logger.exception(f"Error handling request: {e}")
+            response = error_response(e)
+        # Frames are written synchronously on the loop thread, so they never interleave
+        write_response(out, response)
+
+    while True:
+        try:
+            line = await readline()
+            if not line:
+                break
+            request = orjson.loads(line)
+        except Exception as e:
+            logger.exception(f"Error handling request: {e}")
+            write_response(out, error_response(e))
+            continue
+        task = asyncio.create_task(respond(request))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    # Finish requests still in flight before stdout goes away
+    if pending:
+        await asyncio.gather(*pending)
+    executor.shutdown()
+
+
 def main():
     """Main MCP server loop using stdio transport"""
     logger.info("Agent MCP server starting...")
     logger.info(f"Azure OpenAI configured: {client is not None}")
 
-    for line in sys.stdin:
-        try:
-            request = json.loads(line)
-            response = handle_request(request)
-            print(json.dumps(response), flush=True)
-        except Exception as e:
-            logger.exception(f"Error handling request: {e}")
-            error_response = {
-                "jsonrpc": "2.0",
-                "id": None,
-                "error": {"code": -32603, "message": str(e)},
-            }
-            print(json.dumps(error_response), flush=True)
+    loop_name, loop_factory = event_loop_factory()
+    logger.info(f"Using {loop_name} event loop")
+
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(serve())
 
 
 if __name__ == "__main__":
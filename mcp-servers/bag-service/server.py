@@ -40,395 +40,390 @@ Cross-Service Linking:
 Response Format: JSON-LD with @context for semantic interoperability
 """
 
-import json
+import asyncio
+import functools
+import os
+import stat
 import sys
 
-from rdflib import Graph, Literal, Namespace, URIRef
-from rdflib.namespace import RDF, XSD
-
-# Define namespace
-GEO = Namespace("http://imx-geo-prime.org/geospatial#")
+import orjson
+
+# BAG sample data
+ADDRESSES = [
+    # (locationId, streetName, houseNumber, postalCode, municipality, province)
+    ("LOC001", "Damrak", "1", "1012 LG", "Amsterdam", "Noord-Holland"),
+    ("LOC002", "Oudegracht", "231", "3511 NK", "Utrecht", "Utrecht"),
+    ("LOC003", "Coolsingel", "40", "3011 AD", "Rotterdam", "Zuid-Holland"),
+    ("LOC004", "Grote Markt", "1", "9712 HN", "Groningen", "Groningen"),
+    ("LOC005", "Markt", "87", "5611 EB", "Eindhoven", "Noord-Brabant"),
+]
+
+BUILDINGS = [
+    # (locationId, buildingId, purpose, constructionYear, status, surfaceArea, units)
+    ("LOC001", "BAG-0363010012345678", "office", 1920, "in_use", 4500.0, 12),
+    ("LOC002", "BAG-0344010023456789", "education", 1636, "in_use", 3200.0, 8),
+    ("LOC003", "BAG-0599010034567890", "government", 1914, "in_use", 12000.0, 1),
+    ("LOC004", "BAG-0014010045678901", "retail", 1890, "in_use", 850.0, 3),
+    ("LOC005", "BAG-0772010056789012", "residential", 1965, "in_use", 120.0, 1),
+]
+
+# JSON-LD context shared by every response
+_CONTEXT = {"geo": "http://imx-geo-prime.org/geospatial#"}
+
+# The tools serve the data from parallel per-field lists (row i of every address list is the
+# same address); numbers are kept in their string form
+_LOC_IDS, _STREETS, _HOUSE_NUMS, _POSTALS, _MUNICIPALITIES, _PROVINCES = (
+    list(column) for column in zip(*ADDRESSES, strict=True)
+)
+(
+    _BUILDING_LOC_IDS,
+    _BUILDING_IDS,
+    _PURPOSES,
+    _YEARS,
+    _STATUSES,
+    _AREAS,
+    _UNITS,
+) = ([str(value) for value in column] for column in zip(*BUILDINGS, strict=True))
+
+# Casefolded search text per address; fields are joined with NUL so a query can't match
+# across two of them
+_HAYSTACKS = [
+    "\x00".join(fields).casefold()
+    for fields in zip(_STREETS, _MUNICIPALITIES, _POSTALS, _LOC_IDS, strict=True)
+]
+# Casefolded words of the same fields per address, for multi-word queries
+_WORDS = [frozenset(haystack.replace("\x00", " ").split()) for haystack in _HAYSTACKS]
+
+# Row of the first address/building registered for each location
+_IDX_BY_LOC = {loc_id: i for i, loc_id in reversed(list(enumerate(_LOC_IDS)))}
+_BUILDING_IDX_BY_LOC = {loc_id: i for i, loc_id in reversed(list(enumerate(_BUILDING_LOC_IDS)))}
+
+
+def _address_record(i):
+    """Build the JSON-LD node of the address in row i"""
+    return {
+        "@type": "geo:Address",
+        "geo:locationId": _LOC_IDS[i],
+        "geo:streetName": _STREETS[i],
+        "geo:houseNumber": _HOUSE_NUMS[i],
+        "geo:postalCode": _POSTALS[i],
+        "geo:municipality": _MUNICIPALITIES[i],
+        "geo:province": _PROVINCES[i],
+    }
 
-# Initialize in-memory RDF graph
-graph = Graph()
-graph.bind("geo", GEO)
 
+# find_address result for queries nothing matches
+_EMPTY_RESULT = {"@context": _CONTEXT, "@graph": []}
 
-def init_data():
-    """Initialize BAG sample data for addresses and buildings"""
 
-    addresses = [
-        # (locationId, streetName, houseNumber, postalCode, municipality, province)
-        ("LOC001", "Damrak", "1", "1012 LG", "Amsterdam", "Noord-Holland"),
-        ("LOC002", "Oudegracht", "231", "3511 NK", "Utrecht", "Utrecht"),
-        ("LOC003", "Coolsingel", "40", "3011 AD", "Rotterdam", "Zuid-Holland"),
-        ("LOC004", "Grote Markt", "1", "9712 HN", "Groningen", "Groningen"),
-        ("LOC005", "Markt", "87", "5611 EB", "Eindhoven", "Noord-Brabant"),
-    ]
+@functools.lru_cache(maxsize=512)
+def _find_normalized(query_folded):
+    """Search the addresses for a stripped, casefolded query; hits and misses are cached"""
+    # With several words, an address also matches when each word is a whole word of one of
+    # its fields ("Damrak Amsterdam"), so fragments like "ams terdam" don't match anything
+    terms = frozenset(query_folded.split())
+    multi_term = len(terms) > 1
 
-    buildings = [
-        # (locationId, buildingId, purpose, constructionYear, status, surfaceArea, units)
-        ("LOC001", "BAG-0363010012345678", "office", 1920, "in_use", 4500.0, 12),
-        ("LOC002", "BAG-0344010023456789", "education", 1636, "in_use", 3200.0, 8),
-        ("LOC003", "BAG-0599010034567890", "government", 1914, "in_use", 12000.0, 1),
-        ("LOC004", "BAG-0014010045678901", "retail", 1890, "in_use", 850.0, 3),
-        ("LOC005", "BAG-0772010056789012", "residential", 1965, "in_use", 120.0, 1),
+    # Search in street, municipality, postal code, and location ID; only matching rows are
+    # turned into dicts
+    results = [
+        _address_record(i)
+        for i, haystack in enumerate(_HAYSTACKS)
+        if query_folded in haystack or (multi_term and terms <= _WORDS[i])
     ]
 
-    for loc_id, street, house_num, postal, municipality, province in addresses:
-        address_uri = URIRef(f"http://imx-geo-prime.org/bag/addresses/{loc_id}")
-
-        graph.add((address_uri, RDF.type, GEO.Address))
-        graph.add((address_uri, GEO.locationId, Literal(loc_id)))
-        graph.add((address_uri, GEO.streetName, Literal(street)))
-        graph.add((address_uri, GEO.houseNumber, Literal(house_num)))
-        graph.add((address_uri, GEO.postalCode, Literal(postal)))
-        graph.add((address_uri, GEO.municipality, Literal(municipality)))
-        graph.add((address_uri, GEO.province, Literal(province)))
-
-    for loc_id, building_id, purpose, year, status, area, units in buildings:
-        building_uri = URIRef(f"http://imx-geo-prime.org/bag/buildings/{building_id}")
-
-        graph.add((building_uri, RDF.type, GEO.Building))
-        graph.add((building_uri, GEO.locationId, Literal(loc_id)))
-        graph.add((building_uri, GEO.buildingId, Literal(building_id)))
-        graph.add((building_uri, GEO.buildingPurpose, Literal(purpose)))
-        graph.add((building_uri, GEO.constructionYear, Literal(year, datatype=XSD.integer)))
-        graph.add((building_uri, GEO.buildingStatus, Literal(status)))
-        graph.add((building_uri, GEO.surfaceArea, Literal(area, datatype=XSD.decimal)))
-        graph.add((building_uri, GEO.numberOfUnits, Literal(units, datatype=XSD.integer)))
-
-
-init_data()
+    if not results:
+        return _EMPTY_RESULT
+    return {"@context": _CONTEXT, "@graph": results}
 
 
 def find_address(query):
     """Find addresses by searching street name, municipality, or postal code"""
-    query_lower = query.lower()
-    results = []
-
-    for address_uri in graph.subjects(RDF.type, GEO.Address):
-        loc_id = str(graph.value(address_uri, GEO.locationId))
-        street = str(graph.value(address_uri, GEO.streetName))
-        house_num = str(graph.value(address_uri, GEO.houseNumber))
-        postal = str(graph.value(address_uri, GEO.postalCode))
-        municipality = str(graph.value(address_uri, GEO.municipality))
-        province = str(graph.value(address_uri, GEO.province))
-
-        # Search in street, municipality, postal code, and location ID
-        if (
-            query_lower in street.lower()
-            or query_lower in municipality.lower()
-            or query_lower in postal.lower()
-            or query_lower in loc_id.lower()
-        ):
-            results.append(
-                {
-                    "@type": "geo:Address",
-                    "geo:locationId": loc_id,
-                    "geo:streetName": street,
-                    "geo:houseNumber": house_num,
-                    "geo:postalCode": postal,
-                    "geo:municipality": municipality,
-                    "geo:province": province,
-                }
-            )
-
-    return {"@context": {"geo": "http://imx-geo-prime.org/geospatial#"}, "@graph": results}
-
-
-def get_building(location_id):
-    """Get building data by location ID"""
-    # Find building for this location
-    building_uri = None
-    for building in graph.subjects(RDF.type, GEO.Building):
-        if str(graph.value(building, GEO.locationId)) == location_id:
-            building_uri = building
-            break
-
-    if not building_uri:
-        return None
-
-    # Get address info
-    address_uri = None
-    for addr in graph.subjects(RDF.type, GEO.Address):
-        if str(graph.value(addr, GEO.locationId)) == location_id:
-            address_uri = addr
-            break
-
+    # Case and surrounding whitespace don't change what matches, so "amsterdam" and
+    # "Amsterdam " share one cache entry
+    query_folded = query.strip().casefold()
+    if not query_folded and query:
+        # Only whitespace: stripping must not turn it into the list-everything query ""
+        return _EMPTY_RESULT
+    return _find_normalized(query_folded)
+
+
+def _building_record(b):
+    """Build the get_building payload of the building in row b, with its address merged in"""
+    location_id = _BUILDING_LOC_IDS[b]
     result = {
-        "@context": {"geo": "http://imx-geo-prime.org/geospatial#"},
-        "@id": str(building_uri),
+        "@context": _CONTEXT,
+        "@id": f"http://imx-geo-prime.org/bag/buildings/{_BUILDING_IDS[b]}",
         "@type": "geo:Building",
         "geo:locationId": location_id,
-        "geo:buildingId": str(graph.value(building_uri, GEO.buildingId)),
-        "geo:buildingPurpose": str(graph.value(building_uri, GEO.buildingPurpose)),
-        "geo:constructionYear": str(graph.value(building_uri, GEO.constructionYear)),
-        "geo:buildingStatus": str(graph.value(building_uri, GEO.buildingStatus)),
-        "geo:surfaceArea": str(graph.value(building_uri, GEO.surfaceArea)),
-        "geo:numberOfUnits": str(graph.value(building_uri, GEO.numberOfUnits)),
+        "geo:buildingId": _BUILDING_IDS[b],
+        "geo:buildingPurpose": _PURPOSES[b],
+        "geo:constructionYear": _YEARS[b],
+        "geo:buildingStatus": _STATUSES[b],
+        "geo:surfaceArea": _AREAS[b],
+        "geo:numberOfUnits": _UNITS[b],
     }
 
-    if address_uri:
+    a = _IDX_BY_LOC.get(location_id)
+    if a is not None:
         result["geo:address"] = {
-            "geo:streetName": str(graph.value(address_uri, GEO.streetName)),
-            "geo:houseNumber": str(graph.value(address_uri, GEO.houseNumber)),
-            "geo:postalCode": str(graph.value(address_uri, GEO.postalCode)),
-            "geo:municipality": str(graph.value(address_uri, GEO.municipality)),
+            "geo:streetName": _STREETS[a],
+            "geo:houseNumber": _HOUSE_NUMS[a],
+            "geo:postalCode": _POSTALS[a],
+            "geo:municipality": _MUNICIPALITIES[a],
         }
 
     return result
 
 
+# get_building payloads by location, joined with their address once at startup
+_BUILDINGS_BY_LOC = {loc_id: _building_record(b) for loc_id, b in _BUILDING_IDX_BY_LOC.items()}
+
+
+def get_building(location_id):
+    """Get building data by location ID"""
+    return _BUILDINGS_BY_LOC.get(location_id)
+
+
 def list_addresses():
     """List all registered addresses"""
-    addresses = []
-
-    for address_uri in graph.subjects(RDF.type, GEO.Address):
-        loc_id = str(graph.value(address_uri, GEO.locationId))
-        street = str(graph.value(address_uri, GEO.streetName))
-        house_num = str(graph.value(address_uri, GEO.houseNumber))
-        municipality = str(graph.value(address_uri, GEO.municipality))
-
-        addresses.append(
-            {
-                "@type": "geo:Address",
-                "geo:locationId": loc_id,
-                "geo:streetName": street,
-                "geo:houseNumber": house_num,
-                "geo:municipality": municipality,
-            }
-        )
+    addresses = [
+        {
+            "@type": "geo:Address",
+            "geo:locationId": _LOC_IDS[i],
+            "geo:streetName": _STREETS[i],
+            "geo:houseNumber": _HOUSE_NUMS[i],
+            "geo:municipality": _MUNICIPALITIES[i],
+        }
+        for i in range(len(_LOC_IDS))
+    ]
 
-    return {"@context": {"geo": "http://imx-geo-prime.org/geospatial#"}, "@graph": addresses}
+    return {"@context": _CONTEXT, "@graph": addresses}
 
 
 def get_address(location_id):
     """Get full address details by location ID"""
-    address_uri = None
-    for addr in graph.subjects(RDF.type, GEO.Address):
-        if str(graph.value(addr, GEO.locationId)) == location_id:
-            address_uri = addr
-            break
-
-    if not address_uri:
+    i = _IDX_BY_LOC.get(location_id)
+    if i is None:
         return None
 
     return {
-        "@context": {"geo": "http://imx-geo-prime.org/geospatial#"},
-        "@id": str(address_uri),
-        "@type": "geo:Address",
-        "geo:locationId": location_id,
-        "geo:streetName": str(graph.value(address_uri, GEO.streetName)),
-        "geo:houseNumber": str(graph.value(address_uri, GEO.houseNumber)),
-        "geo:postalCode": str(graph.value(address_uri, GEO.postalCode)),
-        "geo:municipality": str(graph.value(address_uri, GEO.municipality)),
-        "geo:province": str(graph.value(address_uri, GEO.province)),
+        "@context": _CONTEXT,
+        "@id": f"http://imx-geo-prime.org/bag/addresses/{location_id}",
+        **_address_record(i),
     }
 
 
-def handle_request(request):
-    """Handle MCP JSON-RPC request"""
-    method = request.get("method")
-    params = request.get("params", {})
-    request_id = request.get("id")
+def _text_result(text, is_error=False):
+    """Build an MCP tools/call result holding one text item"""
+    result = {"content": [{"type": "text", "text": text}]}
+    if is_error:
+        result["isError"] = True
+    return result
 
-    if method == "initialize":
-        return {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "result": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {"tools": {}},
-                "serverInfo": {
-                    "name": "bag-service",
-                    "version": "1.0.0",
-                    "description": (
-                        "BAG (Basisregistratie Adressen en Gebouwen) MCP Server. "
-                        "Provides official Dutch address and building registration data. "
-                        "Data source: Kadaster BAG (kadaster.nl/bag). "
-                        "Use this service for questions about: street addresses, postal codes, "
-                        "building purposes (residential/office/retail), construction years, "
-                        "building status, and floor areas."
-                    ),
-                },
-            },
-        }
 
-    elif method == "tools/list":
-        return {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "result": {
-                "tools": [
-                    {
-                        "name": "find_address",
-                        "description": (
-                            "Search for addresses in the BAG register by street name, city, "
-                            "or postal code. USE THIS TOOL FIRST when you need to find a "
-                            "location. Returns location IDs that can be used with get_building "
-                            "and other BAG tools, as well as with BGT and BRT services. "
-                            "EXAMPLE: find_address('Amsterdam') returns all Amsterdam addresses. "
-                            "EXAMPLE: find_address('Damrak') returns addresses on Damrak street."
-                        ),
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "query": {
-                                    "type": "string",
-                                    "description": (
-                                        "Search term: street name, city/municipality, or postal "
-                                        "code. Case-insensitive partial matching supported."
-                                    ),
-                                }
-                            },
-                            "required": ["query"],
-                        },
-                    },
-                    {
-                        "name": "get_building",
-                        "description": (
-                            "Get detailed building information from BAG for a specific location. "
-                            "PREREQUISITE: Use find_address first to get a valid locationId. "
-                            "RETURNS: Building purpose (residential/office/retail/education/etc.), "
-                            "construction year, building status, surface area in m², number of "
-                            "units, and the linked address. "
-                            "USE FOR: Questions about what type of building is at a location, "
-                            "when it was built, or how large it is."
-                        ),
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "location_id": {
-                                    "type": "string",
-                                    "description": (
-                                        "Location identifier from find_address. "
-                                        "Format: 'LOC' followed by digits (e.g., 'LOC001')."
-                                    ),
-                                }
-                            },
-                            "required": ["location_id"],
-                        },
-                    },
-                    {
-                        "name": "get_address",
+def _json_result(value):
+    """Build an MCP tools/call result holding value as compact JSON text"""
+    return _text_result(orjson.dumps(value).decode())
+
+
+def _not_found_result(kind, location_id):
+    """Build the error result for a location without a building or address"""
+    return _text_result(f"No {kind} found for location {location_id}", is_error=True)
+
+
+# The *_result builders cache the MCP result with its serialized JSON: the data never changes
+# after startup, so a repeated call skips both the lookup and the serialization
+@functools.lru_cache(maxsize=256)
+def find_address_result(query):
+    """Build the MCP result of find_address"""
+    result = find_address(query)
+
+    if not result.get("@graph"):
+        return _text_result(
+            f"No addresses found matching '{query}'. "
+            "Try searching by city name, street, or postal code."
+        )
+
+    return _json_result(result)
+
+
+@functools.lru_cache(maxsize=256)
+def get_building_result(location_id):
+    """Build the MCP result of get_building"""
+    result = get_building(location_id)
+
+    if result is None:
+        return _not_found_result("building", location_id)
+
+    return _json_result(result)
+
+
+@functools.lru_cache(maxsize=256)
+def get_address_result(location_id):
+    """Build the MCP result of get_address"""
+    result = get_address(location_id)
+
+    if result is None:
+        return _not_found_result("address", location_id)
+
+    return _json_result(result)
+
+
+@functools.lru_cache(maxsize=1)
+def list_addresses_result():
+    """Build the MCP result of list_addresses"""
+    return _json_result(list_addresses())
+
+
+# tools/call handlers by tool name, each taking the call's arguments
+_TOOL_HANDLERS = {
+    "find_address": lambda args: find_address_result(args.get("query", "")),
+    "get_building": lambda args: get_building_result(args.get("location_id")),
+    "get_address": lambda args: get_address_result(args.get("location_id")),
+    "list_addresses": lambda args: list_addresses_result(),
+}
+
+
+# The initialize and tools/list results never change; built once at import
+_INITIALIZE_RESULT = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {"tools": {}},
+    "serverInfo": {
+        "name": "bag-service",
+        "version": "1.0.0",
+        "description": (
+            "BAG (Basisregistratie Adressen en Gebouwen) MCP Server. "
+            "Provides official Dutch address and building registration data. "
+            "Data source: Kadaster BAG (kadaster.nl/bag). "
+            "Use this service for questions about: street addresses, postal codes, "
+            "building purposes (residential/office/retail), construction years, "
+            "building status, and floor areas."
+        ),
+    },
+}
+
+_TOOLS_LIST_RESULT = {
+    "tools": [
+        {
+            "name": "find_address",
+            "description": (
+                "Search for addresses in the BAG register by street name, city, "
+                "or postal code. USE THIS TOOL FIRST when you need to find a "
+                "location. Returns location IDs that can be used with get_building "
+                "and other BAG tools, as well as with BGT and BRT services. "
+                "EXAMPLE: find_address('Amsterdam') returns all Amsterdam addresses. "
+                "EXAMPLE: find_address('Damrak') returns addresses on Damrak street. "
+                "EXAMPLE: find_address('Damrak Amsterdam') returns addresses matching "
+                "both words."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
                         "description": (
-                            "Get full address details for a location ID. "
-                            "RETURNS: Street name, house number, postal code, municipality, "
-                            "and province. Use when you need complete address information."
+                            "Search term: street name, city/municipality, or postal "
+                            "code. Case-insensitive partial matching supported; "
+                            "with several words, each must be a whole word of one of "
+                            "the fields."
                         ),
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "location_id": {
-                                    "type": "string",
-                                    "description": "Location identifier from find_address.",
-                                }
-                            },
-                            "required": ["location_id"],
-                        },
-                    },
-                    {
-                        "name": "list_addresses",
+                    }
+                },
+                "required": ["query"],
+            },
+        },
+        {
+            "name": "get_building",
+            "description": (
+                "Get detailed building information from BAG for a specific location. "
+                "PREREQUISITE: Use find_address first to get a valid locationId. "
+                "RETURNS: Building purpose (residential/office/retail/education/etc.), "
+                "construction year, building status, surface area in m², number of "
+                "units, and the linked address. "
+                "USE FOR: Questions about what type of building is at a location, "
+                "when it was built, or how large it is."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "location_id": {
+                        "type": "string",
                         "description": (
-                            "List ALL addresses in the BAG database. Use when you need an "
-                            "overview of available locations or want to browse without a "
-                            "specific search term. Returns summary info for each address."
+                            "Location identifier from find_address. "
+                            "Format: 'LOC' followed by digits (e.g., 'LOC001')."
                         ),
-                        "inputSchema": {"type": "object", "properties": {}},
-                    },
-                ]
+                    }
+                },
+                "required": ["location_id"],
             },
-        }
+        },
+        {
+            "name": "get_address",
+            "description": (
+                "Get full address details for a location ID. "
+                "RETURNS: Street name, house number, postal code, municipality, "
+                "and province. Use when you need complete address information."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "location_id": {
+                        "type": "string",
+                        "description": "Location identifier from find_address.",
+                    }
+                },
+                "required": ["location_id"],
+            },
+        },
+        {
+            "name": "list_addresses",
+            "description": (
+                "List ALL addresses in the BAG database. Use when you need an "
+                "overview of available locations or want to browse without a "
+                "specific search term. Returns summary info for each address."
+            ),
+            "inputSchema": {"type": "object", "properties": {}},
+        },
+    ]
+}
+
+
+def handle_initialize(request_id, params):
+    """Answer the MCP initialize handshake"""
+    return {"jsonrpc": "2.0", "id": request_id, "result": _INITIALIZE_RESULT}
+
+
+def handle_tools_list(request_id, params):
+    """List the tools this server provides"""
+    return {"jsonrpc": "2.0", "id": request_id, "result": _TOOLS_LIST_RESULT}
+
+
+def handle_tools_call(request_id, params):
+    """Run a tool; None for an unknown tool"""
+    handler = _TOOL_HANDLERS.get(params.get("name"))
+    if handler is None:
+        return None
+    return {"jsonrpc": "2.0", "id": request_id, "result": handler(params.get("arguments", {}))}
+
+
+# JSON-RPC handlers by method name
+_METHOD_HANDLERS = {
+    "initialize": handle_initialize,
+    "tools/list": handle_tools_list,
+    "tools/call": handle_tools_call,
+}
 
-    elif method == "tools/call":
-        tool_name = params.get("name")
-        tool_args = params.get("arguments", {})
-
-        if tool_name == "find_address":
-            query = tool_args.get("query", "")
-            result = find_address(query)
-
-            if not result.get("@graph"):
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": (
-                                    f"No addresses found matching '{query}'. "
-                                    "Try searching by city name, street, or postal code."
-                                ),
-                            }
-                        ],
-                    },
-                }
-
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
-
-        elif tool_name == "get_building":
-            location_id = tool_args.get("location_id")
-            result = get_building(location_id)
-
-            if result is None:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"No building found for location {location_id}",
-                            }
-                        ],
-                        "isError": True,
-                    },
-                }
-
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
-
-        elif tool_name == "get_address":
-            location_id = tool_args.get("location_id")
-            result = get_address(location_id)
-
-            if result is None:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"No address found for location {location_id}",
-                            }
-                        ],
-                        "isError": True,
-                    },
-                }
-
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
-
-        elif tool_name == "list_addresses":
-            result = list_addresses()
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
+
+def handle_request(request):
+    """Handle MCP JSON-RPC request"""
+    method = request.get("method")
+    request_id = request.get("id")
+
+    handler = _METHOD_HANDLERS.get(method)
+    response = handler(request_id, request.get("params", {})) if handler else None
+    if response is not None:
+        return response
 
     # Unknown method
     return {
@@ -438,20 +433,108 @@ def handle_request(request):
     }
 
 
+# Longest JSON-RPC request line accepted on stdin
+MAX_REQUEST_BYTES = 1024 * 1024
+
+
+def error_response(code, message):
+    """Build a JSON-RPC error response for a request that could not be handled"""
+    return {"jsonrpc": "2.0", "id": None, "error": {"code": code, "message": message}}
+
+
+def parse_request(line):
+    """
+    Parse one request line
+
+    Returns:
+        A (request, error response) pair of which exactly one is set
+    """
+    try:
+        # orjson rejects documents nested deeper than 1024 levels
+        request = orjson.loads(line)
+    except orjson.JSONDecodeError as e:
+        return None, error_response(-32700, f"Parse error: {e}")
+
+    if not isinstance(request, dict):
+        return None, error_response(-32600, "Request must be a JSON object")
+    return request, None
+
+
+def write_response(out, response):
+    """Write one JSON-RPC response as a single newline-terminated frame"""
+    try:
+        data = orjson.dumps(response, option=orjson.OPT_APPEND_NEWLINE)
+    except orjson.JSONEncodeError as e:
+        data = orjson.dumps(error_response(-32603, str(e)), option=orjson.OPT_APPEND_NEWLINE)
+    # One buffered write and flush per message, so each reaches the pipe in one syscall
+    out.write(data)
+    out.flush()
+
+
+async def read_frames(reader):
+    """
+    Yield the request lines from stdin as they arrive
+
+    Lines longer than MAX_REQUEST_BYTES are dropped without being buffered whole and yielded
+    as None.
+    """
+    while True:
+        try:
+            yield await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            # End of input; the last line may lack its newline
+            if e.partial:
+                yield e.partial
+            return
+        except asyncio.LimitOverrunError as e:
+            # Discard up to the end of the oversized line, which may not have arrived yet
+            await reader.readexactly(e.consumed)
+            while True:
+                try:
+                    await reader.readuntil(b"\n")
+                    break
+                except asyncio.LimitOverrunError as rest:
+                    await reader.readexactly(rest.consumed)
+                except asyncio.IncompleteReadError:
+                    break
+            yield None
+
+
+async def serve():
+    """Read JSON-RPC requests from stdin and answer them on stdout, in order"""
+    loop = asyncio.get_running_loop()
+    # Read and write bytes directly, skipping the text layer's decoding and encoding
+    out = sys.stdout.buffer
+
+    # The loop reads stdin without blocking as data arrives, so requests a client pipelines
+    # are already buffered while earlier ones are answered. Regular files (e.g.
+    # `server.py < requests.jsonl`) cannot be watched by the loop and are read directly.
+    if stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode):
+        reader = asyncio.StreamReader(limit=MAX_REQUEST_BYTES)
+        reader.feed_data(sys.stdin.buffer.read())
+        reader.feed_eof()
+    else:
+        reader = asyncio.StreamReader(limit=MAX_REQUEST_BYTES)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer)
+
+    # The tools are pure in-memory lookups, so each request is answered inline on the loop
+    # thread; handing it to a worker thread would cost more than the lookup itself
+    async for line in read_frames(reader):
+        if line is None:
+            response = error_response(-32600, f"Request exceeds {MAX_REQUEST_BYTES} bytes")
+        else:
+            request, response = parse_request(line)
+            if request is not None:
+                try:
+                    response = handle_request(request)
+                except Exception as e:
+                    response = error_response(-32603, str(e))
+        write_response(out, response)
+
+
 def main():
     """Main MCP server loop using stdio transport"""
-    for line in sys.stdin:
-        try:
-            request = json.loads(line)
-            response = handle_request(request)
-            print(json.dumps(response), flush=True)
-        except Exception as e:
-            error_response = {
-                "jsonrpc": "2.0",
-                "id": None,
-                "error": {"code": -32603, "message": str(e)},
-            }
-            print(json.dumps(error_response), flush=True)
+    asyncio.run(serve())
 
 
 if __name__ == "__main__":
@@ -45,516 +45,586 @@ Cross-Service Linking:
 Response Format: JSON-LD with @context for semantic interoperability
 """
 
-import json
+import asyncio
+import bisect
+import functools
+import os
+import stat
 import sys
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+
+# BGT sample data: topographic areas linked to locations
+AREAS = [
+    # (locationId, areaId, areaType, surfaceType, managedBy, areaSize)
+    ("LOC001", "BGT-A001", "mixed_urban", "paved", "Gemeente Amsterdam", 2500.0),
+    ("LOC002", "BGT-A002", "urban_center", "brick", "Gemeente Utrecht", 1800.0),
+    ("LOC003", "BGT-A003", "civic_square", "concrete", "Gemeente Rotterdam", 5000.0),
+    ("LOC004", "BGT-A004", "market_square", "brick", "Gemeente Groningen", 3200.0),
+    ("LOC005", "BGT-A005", "residential", "mixed", "Gemeente Eindhoven", 800.0),
+]
+
+# Roads near locations
+ROADS = [
+    # (locationId, roadId, roadType, surfaceType, roadName, managedBy)
+    ("LOC001", "BGT-R001", "local", "asphalt", "Damrak", "Gemeente Amsterdam"),
+    ("LOC001", "BGT-R002", "cycleway", "asphalt", "Damrak fietspad", "Gemeente Amsterdam"),
+    ("LOC002", "BGT-R003", "local", "brick", "Oudegracht", "Gemeente Utrecht"),
+    ("LOC003", "BGT-R004", "regional", "asphalt", "Coolsingel", "Gemeente Rotterdam"),
+    ("LOC003", "BGT-R005", "tram_track", "rail", "Coolsingel tramlijn", "RET"),
+    ("LOC004", "BGT-R006", "pedestrian", "brick", "Grote Markt", "Gemeente Groningen"),
+]
+
+# Water bodies near locations
+WATER_BODIES = [
+    # (locationId, waterId, waterType, waterName, managedBy, width)
+    ("LOC001", "BGT-W001", "canal", "Damrak (water)", "Waternet", 25.0),
+    (
+        "LOC002",
+        "BGT-W002",
+        "canal",
+        "Oudegracht",
+        "Hoogheemraadschap De Stichtse Rijnlanden",
+        12.0,
+    ),
+    ("LOC003", "BGT-W003", "river", "Nieuwe Maas", "Rijkswaterstaat", 350.0),
+    ("LOC004", "BGT-W004", "canal", "Hoornsediep", "Waterschap Noorderzijlvest", 15.0),
+]
+
+# Tool results are compact JSON; BGT_PRETTY=1 indents them for reading by hand
+_PRETTY_JSON = os.environ.get("BGT_PRETTY", "0").lower() in ("1", "true", "yes")
+_JSON_OPTIONS = orjson.OPT_INDENT_2 if _PRETTY_JSON else 0
+
+_CONTEXT = {"geo": "http://imx-geo-prime.org/geospatial#"}
+
+# JSON-LD @type of each feature kind, shared by all entries of that kind
+TYPE_AREA = sys.intern("geo:TopographicArea")
+TYPE_ROAD = sys.intern("geo:Road")
+TYPE_WATER = sys.intern("geo:WaterBody")
+
+
+@dataclass(slots=True, frozen=True)
+class Area:
+    """A classified land area near a location"""
+
+    location_id: str
+    area_id: str
+    area_type: str
+    surface_type: str
+    managed_by: str
+    area_size: str
+
+    def search_fields(self) -> tuple[str, str, str]:
+        """Values find_area matches the query against"""
+        return (self.location_id, self.area_type, self.managed_by)
+
+    def summary(self) -> dict:
+        """JSON-LD entry in find_area results"""
+        return {
+            "@type": TYPE_AREA,
+            "geo:locationId": self.location_id,
+            "geo:areaId": self.area_id,
+            "geo:areaType": self.area_type,
+            "geo:surfaceType": self.surface_type,
+            "geo:managedBy": self.managed_by,
+        }
 
-from rdflib import Graph, Literal, Namespace, URIRef
-from rdflib.namespace import RDF, XSD
+    def details(self) -> dict:
+        """JSON-LD entry in the results for one location"""
+        return {
+            "@type": TYPE_AREA,
+            "geo:areaId": self.area_id,
+            "geo:areaType": self.area_type,
+            "geo:surfaceType": self.surface_type,
+            "geo:managedBy": self.managed_by,
+            "geo:areaSize": self.area_size,
+        }
 
-# Define namespace
-GEO = Namespace("http://imx-geo-prime.org/geospatial#")
 
-# Initialize in-memory RDF graph
-graph = Graph()
-graph.bind("geo", GEO)
+@dataclass(slots=True, frozen=True)
+class Road:
+    """A road segment near a location"""
 
+    location_id: str
+    road_id: str
+    road_type: str
+    surface_type: str
+    road_name: str
+    managed_by: str
 
-def init_data():
-    """Initialize BGT sample data for topographic features"""
+    def search_fields(self) -> tuple[str, str, str]:
+        """Values find_area matches the query against"""
+        return (self.location_id, self.road_name, self.road_type)
 
-    # Topographic areas linked to locations
-    areas = [
-        # (locationId, areaId, areaType, surfaceType, managedBy, areaSize)
-        ("LOC001", "BGT-A001", "mixed_urban", "paved", "Gemeente Amsterdam", 2500.0),
-        ("LOC002", "BGT-A002", "urban_center", "brick", "Gemeente Utrecht", 1800.0),
-        ("LOC003", "BGT-A003", "civic_square", "concrete", "Gemeente Rotterdam", 5000.0),
-        ("LOC004", "BGT-A004", "market_square", "brick", "Gemeente Groningen", 3200.0),
-        ("LOC005", "BGT-A005", "residential", "mixed", "Gemeente Eindhoven", 800.0),
-    ]
+    def summary(self) -> dict:
+        """JSON-LD entry in find_area results"""
+        return {
+            "@type": TYPE_ROAD,
+            "geo:locationId": self.location_id,
+            "geo:roadId": self.road_id,
+            "geo:roadName": self.road_name,
+            "geo:roadType": self.road_type,
+        }
 
-    # Roads near locations
-    roads = [
-        # (locationId, roadId, roadType, surfaceType, roadName, managedBy)
-        ("LOC001", "BGT-R001", "local", "asphalt", "Damrak", "Gemeente Amsterdam"),
-        ("LOC001", "BGT-R002", "cycleway", "asphalt", "Damrak fietspad", "Gemeente Amsterdam"),
-        ("LOC002", "BGT-R003", "local", "brick", "Oudegracht", "Gemeente Utrecht"),
-        ("LOC003", "BGT-R004", "regional", "asphalt", "Coolsingel", "Gemeente Rotterdam"),
-        ("LOC003", "BGT-R005", "tram_track", "rail", "Coolsingel tramlijn", "RET"),
-        ("LOC004", "BGT-R006", "pedestrian", "brick", "Grote Markt", "Gemeente Groningen"),
-    ]
+    def details(self) -> dict:
+        """JSON-LD entry in the results for one location"""
+        return {
+            "@type": TYPE_ROAD,
+            "geo:roadId": self.road_id,
+            "geo:roadName": self.road_name,
+            "geo:roadType": self.road_type,
+            "geo:surfaceType": self.surface_type,
+            "geo:managedBy": self.managed_by,
+        }
 
-    # Water bodies near locations
-    water_bodies = [
-        # (locationId, waterId, waterType, waterName, managedBy, width)
-        ("LOC001", "BGT-W001", "canal", "Damrak (water)", "Waternet", 25.0),
-        (
-            "LOC002",
-            "BGT-W002",
-            "canal",
-            "Oudegracht",
-            "Hoogheemraadschap De Stichtse Rijnlanden",
-            12.0,
-        ),
-        ("LOC003", "BGT-W003", "river", "Nieuwe Maas", "Rijkswaterstaat", 350.0),
-        ("LOC004", "BGT-W004", "canal", "Hoornsediep", "Waterschap Noorderzijlvest", 15.0),
-    ]
 
-    # Add areas to graph
-    for loc_id, area_id, area_type, surface, managed_by, area_size in areas:
-        area_uri = URIRef(f"http://imx-geo-prime.org/bgt/areas/{area_id}")
+@dataclass(slots=True, frozen=True)
+class WaterBody:
+    """A water feature near a location"""
+
+    location_id: str
+    water_id: str
+    water_type: str
+    water_name: str
+    managed_by: str
+    width: str
+
+    def search_fields(self) -> tuple[str, str, str]:
+        """Values find_area matches the query against"""
+        return (self.location_id, self.water_name, self.water_type)
+
+    def summary(self) -> dict:
+        """JSON-LD entry in find_area results"""
+        return {
+            "@type": TYPE_WATER,
+            "geo:locationId": self.location_id,
+            "geo:waterId": self.water_id,
+            "geo:waterName": self.water_name,
+            "geo:waterType": self.water_type,
+        }
+
+    def details(self) -> dict:
+        """JSON-LD entry in the results for one location"""
+        return {
+            "@type": TYPE_WATER,
+            "geo:waterId": self.water_id,
+            "geo:waterName": self.water_name,
+            "geo:waterType": self.water_type,
+            "geo:managedBy": self.managed_by,
+            "geo:width": self.width,
+        }
+
+
+Feature = Area | Road | WaterBody
+
+# Lookup tables built once at startup; the data is read-only, so the tools serve these
+# instead of scanning the sample data on every call. JSON-LD dicts are only built for
+# responses; apart from the get_terrain payloads the tables hold the records themselves
+ALL_AREAS: list[Area] = []  # records per feature kind, in data order
+ALL_ROADS: list[Road] = []
+ALL_WATER: list[WaterBody] = []
+AREAS_BY_LOC: dict[str, list[Area]] = {}  # records by locationId
+ROADS_BY_LOC: dict[str, list[Road]] = {}
+WATER_BY_LOC: dict[str, list[WaterBody]] = {}
+TERRAIN_BY_LOC: dict[str, dict] = {}  # get_terrain payloads by locationId
+# Records of all kinds in find_area result order, with their lowercased searchable fields.
+# The fields are joined with NUL so a query can't match across field boundaries
+_SEARCH_RECORDS: list[Feature] = []
+_SEARCH_BLOBS: list[str] = []
+# Compact JSON of each record's find_area entry, aligned with _SEARCH_RECORDS
+_SEARCH_JSON: list[str] = []
+# Positions in _SEARCH_BLOBS by each three-character substring of a searchable field
+_TRIGRAMS: dict[str, set[int]] = {}
+# Offset of each search blob in _SEARCH_TEXT, plus one past the end
+_BLOB_STARTS: list[int] = []
+
+
+def _interned(rows):
+    """Return the rows with their string values interned"""
+    return [tuple(sys.intern(v) if isinstance(v, str) else v for v in row) for row in rows]
+
+
+def build_indexes():
+    """Index the areas, roads and water bodies by location ID"""
+    # The sizes and widths are rendered as text, as the JSON-LD output has always had them
+    for loc_id, area_id, area_type, surface, managed_by, size in _interned(AREAS):
+        area = Area(loc_id, area_id, area_type, surface, managed_by, str(size))
+        ALL_AREAS.append(area)
+        AREAS_BY_LOC.setdefault(loc_id, []).append(area)
+
+    for loc_id, road_id, road_type, surface, road_name, managed_by in _interned(ROADS):
+        road = Road(loc_id, road_id, road_type, surface, road_name, managed_by)
+        ALL_ROADS.append(road)
+        ROADS_BY_LOC.setdefault(loc_id, []).append(road)
+
+    for loc_id, water_id, water_type, water_name, managed_by, width in _interned(WATER_BODIES):
+        water = WaterBody(loc_id, water_id, water_type, water_name, managed_by, str(width))
+        ALL_WATER.append(water)
+        WATER_BY_LOC.setdefault(loc_id, []).append(water)
+
+    _SEARCH_RECORDS.extend(ALL_AREAS + ALL_ROADS + ALL_WATER)
+    offset = 0
+    for position, record in enumerate(_SEARCH_RECORDS):
+        blob = "\x00".join(record.search_fields()).lower()
+        _SEARCH_BLOBS.append(blob)
+        _SEARCH_JSON.append(orjson.dumps(record.summary()).decode())
+        _BLOB_STARTS.append(offset)
+        offset += len(blob) + 1
+        for field in blob.split("\x00"):
+            for start in range(len(field) - 2):
+                _TRIGRAMS.setdefault(field[start : start + 3], set()).add(position)
+    _BLOB_STARTS.append(offset)
+
+    for loc_id in AREAS_BY_LOC.keys() | ROADS_BY_LOC.keys() | WATER_BY_LOC.keys():
+        TERRAIN_BY_LOC[loc_id] = {
+            "@context": _CONTEXT,
+            "geo:locationId": loc_id,
+            "areas": [area.details() for area in AREAS_BY_LOC.get(loc_id, ())],
+            "roads": [road.details() for road in ROADS_BY_LOC.get(loc_id, ())],
+            "waterBodies": [water.details() for water in WATER_BY_LOC.get(loc_id, ())],
+        }
+
+
+build_indexes()
+
+# All search blobs joined with NUL into one string, so a short query is located with one
+# str.find per hit instead of a substring test per entry
+_SEARCH_TEXT = "\x00".join(_SEARCH_BLOBS)
+
+
+def _match_search_text(query_lower: str) -> tuple[int, ...]:
+    """Positions of the features whose search text contains a stripped, lowercased query"""
+    if "\x00" in query_lower:
+        # NUL only separates fields, no field contains it
+        return ()
+
+    if len(query_lower) < 3:
+        return tuple(_scan_search_text(query_lower))
+
+    # Only entries holding every trigram of the query can contain it; the substring test
+    # below still decides, as trigrams don't capture their order
+    postings: list[set[int]] = [
+        _TRIGRAMS.get(query_lower[start : start + 3], set())
+        for start in range(len(query_lower) - 2)
+    ]
+    postings.sort(key=len)
+    positions = sorted(postings[0].intersection(*postings[1:]))
+    return tuple(i for i in positions if query_lower in _SEARCH_BLOBS[i])
 
-        graph.add((area_uri, RDF.type, GEO.TopographicArea))
-        graph.add((area_uri, GEO.locationId, Literal(loc_id)))
-        graph.add((area_uri, GEO.areaId, Literal(area_id)))
-        graph.add((area_uri, GEO.areaType, Literal(area_type)))
-        graph.add((area_uri, GEO.surfaceType, Literal(surface)))
-        graph.add((area_uri, GEO.managedBy, Literal(managed_by)))
-        graph.add((area_uri, GEO.areaSize, Literal(area_size, datatype=XSD.decimal)))
 
-    # Add roads to graph
-    for loc_id, road_id, road_type, surface, road_name, managed_by in roads:
-        road_uri = URIRef(f"http://imx-geo-prime.org/bgt/roads/{road_id}")
+def _scan_search_text(query_lower: str) -> Iterator[int]:
+    """Yield the positions of the search blobs containing the query, in order"""
+    hit = _SEARCH_TEXT.find(query_lower)
+    while hit >= 0:
+        position = bisect.bisect_right(_BLOB_STARTS, hit) - 1
+        yield position
+        # Resume at the next blob, so each entry is reported once
+        hit = _SEARCH_TEXT.find(query_lower, _BLOB_STARTS[position + 1])
 
-        graph.add((road_uri, RDF.type, GEO.Road))
-        graph.add((road_uri, GEO.locationId, Literal(loc_id)))
-        graph.add((road_uri, GEO.roadId, Literal(road_id)))
-        graph.add((road_uri, GEO.roadType, Literal(road_type)))
-        graph.add((road_uri, GEO.surfaceType, Literal(surface)))
-        graph.add((road_uri, GEO.roadName, Literal(road_name)))
-        graph.add((road_uri, GEO.managedBy, Literal(managed_by)))
 
-    # Add water bodies to graph
-    for loc_id, water_id, water_type, water_name, managed_by, width in water_bodies:
-        water_uri = URIRef(f"http://imx-geo-prime.org/bgt/water/{water_id}")
+# find_area matches for each location ID (lowercased), the most common query; computed by the
+# general search so that an ID which is part of another ID or a name still finds both
+_FIND_BY_LOC = {loc_id.lower(): _match_search_text(loc_id.lower()) for loc_id in TERRAIN_BY_LOC}
 
-        graph.add((water_uri, RDF.type, GEO.WaterBody))
-        graph.add((water_uri, GEO.locationId, Literal(loc_id)))
-        graph.add((water_uri, GEO.waterId, Literal(water_id)))
-        graph.add((water_uri, GEO.waterType, Literal(water_type)))
-        graph.add((water_uri, GEO.waterName, Literal(water_name)))
-        graph.add((water_uri, GEO.managedBy, Literal(managed_by)))
-        graph.add((water_uri, GEO.width, Literal(width, datatype=XSD.decimal)))
 
+@functools.lru_cache(maxsize=512)
+def _find_normalized(query_lower: str) -> tuple[int, ...]:
+    """Find the positions of the features matching a stripped, lowercased query"""
+    if not query_lower:
+        # An empty or blank query asks for nothing in particular
+        return ()
 
-init_data()
+    positions = _FIND_BY_LOC.get(query_lower)
+    if positions is None:
+        positions = _match_search_text(query_lower)
+    return positions
 
 
-def find_area(query):
+def find_area(query: str) -> dict:
     """Find topographic areas by location name, area type, or feature name"""
-    query_lower = query.lower()
-    results = []
-
-    # Search in areas
-    for area_uri in graph.subjects(RDF.type, GEO.TopographicArea):
-        loc_id = str(graph.value(area_uri, GEO.locationId))
-        area_type = str(graph.value(area_uri, GEO.areaType))
-        managed_by = str(graph.value(area_uri, GEO.managedBy))
-
-        if (
-            query_lower in loc_id.lower()
-            or query_lower in area_type.lower()
-            or query_lower in managed_by.lower()
-        ):
-            results.append(
-                {
-                    "@type": "geo:TopographicArea",
-                    "geo:locationId": loc_id,
-                    "geo:areaId": str(graph.value(area_uri, GEO.areaId)),
-                    "geo:areaType": area_type,
-                    "geo:surfaceType": str(graph.value(area_uri, GEO.surfaceType)),
-                    "geo:managedBy": managed_by,
-                }
-            )
-
-    # Search in roads
-    for road_uri in graph.subjects(RDF.type, GEO.Road):
-        loc_id = str(graph.value(road_uri, GEO.locationId))
-        road_name = str(graph.value(road_uri, GEO.roadName))
-        road_type = str(graph.value(road_uri, GEO.roadType))
-
-        if (
-            query_lower in loc_id.lower()
-            or query_lower in road_name.lower()
-            or query_lower in road_type.lower()
-        ):
-            results.append(
-                {
-                    "@type": "geo:Road",
-                    "geo:locationId": loc_id,
-                    "geo:roadId": str(graph.value(road_uri, GEO.roadId)),
-                    "geo:roadName": road_name,
-                    "geo:roadType": road_type,
-                }
-            )
-
-    # Search in water bodies
-    for water_uri in graph.subjects(RDF.type, GEO.WaterBody):
-        loc_id = str(graph.value(water_uri, GEO.locationId))
-        water_name = str(graph.value(water_uri, GEO.waterName))
-        water_type = str(graph.value(water_uri, GEO.waterType))
-
-        if (
-            query_lower in loc_id.lower()
-            or query_lower in water_name.lower()
-            or query_lower in water_type.lower()
-        ):
-            results.append(
-                {
-                    "@type": "geo:WaterBody",
-                    "geo:locationId": loc_id,
-                    "geo:waterId": str(graph.value(water_uri, GEO.waterId)),
-                    "geo:waterName": water_name,
-                    "geo:waterType": water_type,
-                }
-            )
-
-    return {"@context": {"geo": "http://imx-geo-prime.org/geospatial#"}, "@graph": results}
-
-
-def get_terrain(location_id):
+    positions = _find_normalized(query.strip().lower())
+    return {"@context": _CONTEXT, "@graph": [_SEARCH_RECORDS[i].summary() for i in positions]}
+
+
+def get_terrain(location_id: str) -> dict | None:
     """Get all topographic features for a location"""
-    features = {
-        "@context": {"geo": "http://imx-geo-prime.org/geospatial#"},
-        "geo:locationId": location_id,
-        "areas": [],
-        "roads": [],
-        "waterBodies": [],
-    }
+    return TERRAIN_BY_LOC.get(location_id)
 
-    found_any = False
-
-    # Get area info
-    for area_uri in graph.subjects(RDF.type, GEO.TopographicArea):
-        if str(graph.value(area_uri, GEO.locationId)) == location_id:
-            found_any = True
-            features["areas"].append(
-                {
-                    "@type": "geo:TopographicArea",
-                    "geo:areaId": str(graph.value(area_uri, GEO.areaId)),
-                    "geo:areaType": str(graph.value(area_uri, GEO.areaType)),
-                    "geo:surfaceType": str(graph.value(area_uri, GEO.surfaceType)),
-                    "geo:managedBy": str(graph.value(area_uri, GEO.managedBy)),
-                    "geo:areaSize": str(graph.value(area_uri, GEO.areaSize)),
-                }
-            )
-
-    # Get roads
-    for road_uri in graph.subjects(RDF.type, GEO.Road):
-        if str(graph.value(road_uri, GEO.locationId)) == location_id:
-            found_any = True
-            features["roads"].append(
-                {
-                    "@type": "geo:Road",
-                    "geo:roadId": str(graph.value(road_uri, GEO.roadId)),
-                    "geo:roadName": str(graph.value(road_uri, GEO.roadName)),
-                    "geo:roadType": str(graph.value(road_uri, GEO.roadType)),
-                    "geo:surfaceType": str(graph.value(road_uri, GEO.surfaceType)),
-                    "geo:managedBy": str(graph.value(road_uri, GEO.managedBy)),
-                }
-            )
-
-    # Get water bodies
-    for water_uri in graph.subjects(RDF.type, GEO.WaterBody):
-        if str(graph.value(water_uri, GEO.locationId)) == location_id:
-            found_any = True
-            features["waterBodies"].append(
-                {
-                    "@type": "geo:WaterBody",
-                    "geo:waterId": str(graph.value(water_uri, GEO.waterId)),
-                    "geo:waterName": str(graph.value(water_uri, GEO.waterName)),
-                    "geo:waterType": str(graph.value(water_uri, GEO.waterType)),
-                    "geo:managedBy": str(graph.value(water_uri, GEO.managedBy)),
-                    "geo:width": str(graph.value(water_uri, GEO.width)),
-                }
-            )
-
-    return features if found_any else None
-
-
-def get_roads(location_id):
-    """Get road information for a location"""
-    roads = []
-
-    for road_uri in graph.subjects(RDF.type, GEO.Road):
-        if str(graph.value(road_uri, GEO.locationId)) == location_id:
-            roads.append(
-                {
-                    "@type": "geo:Road",
-                    "geo:roadId": str(graph.value(road_uri, GEO.roadId)),
-                    "geo:roadName": str(graph.value(road_uri, GEO.roadName)),
-                    "geo:roadType": str(graph.value(road_uri, GEO.roadType)),
-                    "geo:surfaceType": str(graph.value(road_uri, GEO.surfaceType)),
-                    "geo:managedBy": str(graph.value(road_uri, GEO.managedBy)),
-                }
-            )
 
+def get_roads(location_id: str) -> dict | None:
+    """Get road information for a location"""
+    roads = ROADS_BY_LOC.get(location_id)
     if not roads:
         return None
 
     return {
-        "@context": {"geo": "http://imx-geo-prime.org/geospatial#"},
+        "@context": _CONTEXT,
         "geo:locationId": location_id,
-        "@graph": roads,
+        "@graph": [road.details() for road in roads],
     }
 
 
-def get_water(location_id):
+def get_water(location_id: str) -> dict | None:
     """Get water body information for a location"""
-    water_bodies = []
-
-    for water_uri in graph.subjects(RDF.type, GEO.WaterBody):
-        if str(graph.value(water_uri, GEO.locationId)) == location_id:
-            water_bodies.append(
-                {
-                    "@type": "geo:WaterBody",
-                    "geo:waterId": str(graph.value(water_uri, GEO.waterId)),
-                    "geo:waterName": str(graph.value(water_uri, GEO.waterName)),
-                    "geo:waterType": str(graph.value(water_uri, GEO.waterType)),
-                    "geo:managedBy": str(graph.value(water_uri, GEO.managedBy)),
-                    "geo:width": str(graph.value(water_uri, GEO.width)),
-                }
-            )
-
+    water_bodies = WATER_BY_LOC.get(location_id)
     if not water_bodies:
         return None
 
     return {
-        "@context": {"geo": "http://imx-geo-prime.org/geospatial#"},
+        "@context": _CONTEXT,
         "geo:locationId": location_id,
-        "@graph": water_bodies,
+        "@graph": [water.details() for water in water_bodies],
     }
 
 
-def handle_request(request):
-    """Handle MCP JSON-RPC request"""
-    method = request.get("method")
-    params = request.get("params", {})
-    request_id = request.get("id")
+def _text_result(text: str, is_error: bool = False) -> dict:
+    """Build an MCP tools/call result holding one text item"""
+    result: dict = {"content": [{"type": "text", "text": text}]}
+    if is_error:
+        result["isError"] = True
+    return result
 
-    if method == "initialize":
-        return {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "result": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {"tools": {}},
-                "serverInfo": {
-                    "name": "bgt-service",
-                    "version": "1.0.0",
-                    "description": (
-                        "BGT (Basisregistratie Grootschalige Topografie) MCP Server. "
-                        "Provides large-scale topographic data (1:500-1:5000) including "
-                        "roads, water bodies, terrain types, and land use. "
-                        "Data source: Kadaster/PDOK BGT (pdok.nl/bgt). "
-                        "Use this service for questions about: road types and surfaces, "
-                        "water features (canals, rivers), terrain classification, "
-                        "land use, and infrastructure management authorities."
-                    ),
-                },
-            },
-        }
 
-    elif method == "tools/list":
-        return {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "result": {
-                "tools": [
-                    {
-                        "name": "find_area",
-                        "description": (
-                            "Search for topographic features by location ID, feature name, "
-                            "or type. USE THIS to discover what BGT data is available. "
-                            "Searches across areas, roads, and water bodies. "
-                            "EXAMPLE: find_area('canal') finds all canals. "
-                            "EXAMPLE: find_area('LOC001') finds all features near that location. "
-                            "Returns locationId values usable with other tools."
-                        ),
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "query": {
-                                    "type": "string",
-                                    "description": (
-                                        "Search term: location ID (e.g., 'LOC001'), feature name "
-                                        "(e.g., 'Oudegracht'), or type (e.g., 'canal', 'cycleway')."
-                                    ),
-                                }
-                            },
-                            "required": ["query"],
-                        },
-                    },
-                    {
-                        "name": "get_terrain",
-                        "description": (
-                            "Get complete topographic information for a location including "
-                            "terrain type, roads, and water bodies. "
-                            "PREREQUISITE: Get locationId from BAG find_address or BGT find_area. "
-                            "RETURNS: All BGT features at that location - areas with surface "
-                            "types, roads with classifications, water bodies with types. "
-                            "USE FOR: Understanding the physical environment of a location."
-                        ),
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "location_id": {
-                                    "type": "string",
-                                    "description": "Location identifier (e.g., 'LOC001').",
-                                }
-                            },
-                            "required": ["location_id"],
-                        },
-                    },
-                    {
-                        "name": "get_roads",
-                        "description": (
-                            "Get road infrastructure information for a location. "
-                            "RETURNS: Road names, types (highway/local/cycleway/footpath), "
-                            "surface materials, and managing authorities. "
-                            "USE FOR: Questions about road access, cycling infrastructure, "
-                            "or who maintains the roads."
-                        ),
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "location_id": {
-                                    "type": "string",
-                                    "description": "Location identifier (e.g., 'LOC001').",
-                                }
-                            },
-                            "required": ["location_id"],
-                        },
-                    },
-                    {
-                        "name": "get_water",
+def _json_result(value: dict) -> dict:
+    """Build an MCP tools/call result holding value as JSON text"""
+    return _text_result(orjson.dumps(value, option=_JSON_OPTIONS).decode())
+
+
+def _not_found_result(kind: str, location_id: str) -> dict:
+    """Build the error result for a location without data of the given kind"""
+    return _text_result(f"No {kind} found for location {location_id}", is_error=True)
+
+
+# Start of the compact find_area JSON, up to the first @graph entry
+_FIND_PREFIX = '{"@context":' + orjson.dumps(_CONTEXT).decode() + ',"@graph":['
+
+
+@functools.lru_cache(maxsize=512)
+def find_area_result(query: str) -> dict:
+    """Build the MCP result of find_area"""
+    positions = _find_normalized(query.strip().lower())
+
+    if not positions:
+        return _text_result(
+            f"No topographic features found matching '{query}'. "
+            "Try searching by location ID, feature name, or type "
+            "(e.g., 'canal', 'cycleway', 'LOC001')."
+        )
+
+    if _PRETTY_JSON:
+        return _json_result(find_area(query))
+    # Splice the entries' prebuilt JSON into the envelope instead of building and serializing
+    # the result dicts
+    return _text_result(_FIND_PREFIX + ",".join(_SEARCH_JSON[i] for i in positions) + "]}")
+
+
+@functools.lru_cache(maxsize=512)
+def get_terrain_result(location_id: str) -> dict:
+    """Build the MCP result of get_terrain"""
+    result = get_terrain(location_id)
+
+    if result is None:
+        return _not_found_result("topographic data", location_id)
+
+    return _json_result(result)
+
+
+@functools.lru_cache(maxsize=512)
+def get_roads_result(location_id: str) -> dict:
+    """Build the MCP result of get_roads"""
+    result = get_roads(location_id)
+
+    if result is None:
+        return _not_found_result("road data", location_id)
+
+    return _json_result(result)
+
+
+@functools.lru_cache(maxsize=512)
+def get_water_result(location_id: str) -> dict:
+    """Build the MCP result of get_water"""
+    result = get_water(location_id)
+
+    if result is None:
+        return _not_found_result("water body data", location_id)
+
+    return _json_result(result)
+
+
+# tools/call handlers by tool name, each taking the call's arguments
+_TOOL_HANDLERS: dict[Any, Callable[[dict], dict]] = {
+    "find_area": lambda args: find_area_result(args.get("query", "")),
+    "get_terrain": lambda args: get_terrain_result(args.get("location_id")),
+    "get_roads": lambda args: get_roads_result(args.get("location_id")),
+    "get_water": lambda args: get_water_result(args.get("location_id")),
+}
+
+
+def warm_cache():
+    """Prebuild the tool results for every location ID and searchable field value"""
+    location_ids = TERRAIN_BY_LOC.keys()
+    for location_id in sorted(location_ids):
+        get_terrain_result(location_id)
+        get_roads_result(location_id)
+        get_water_result(location_id)
+
+    # find_area with one of the values it searches (e.g. 'canal', 'LOC001', 'Damrak')
+    terms = {field for record in _SEARCH_RECORDS for field in record.search_fields()}
+    for term in sorted(terms):
+        find_area_result(term)
+
+
+warm_cache()
+
+
+# The initialize and tools/list results never change; built once at import
+_INITIALIZE_RESULT = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {"tools": {}},
+    "serverInfo": {
+        "name": "bgt-service",
+        "version": "1.0.0",
+        "description": (
+            "BGT (Basisregistratie Grootschalige Topografie) MCP Server. "
+            "Provides large-scale topographic data (1:500-1:5000) including "
+            "roads, water bodies, terrain types, and land use. "
+            "Data source: Kadaster/PDOK BGT (pdok.nl/bgt). "
+            "Use this service for questions about: road types and surfaces, "
+            "water features (canals, rivers), terrain classification, "
+            "land use, and infrastructure management authorities."
+        ),
+    },
+}
+
+_TOOLS_LIST_RESULT = {
+    "tools": [
+        {
+            "name": "find_area",
+            "description": (
+                "Search for topographic features by location ID, feature name, "
+                "or type. USE THIS to discover what BGT data is available. "
+                "Searches across areas, roads, and water bodies. "
+                "EXAMPLE: find_area('canal') finds all canals. "
+                "EXAMPLE: find_area('LOC001') finds all features near that location. "
+                "Returns locationId values usable with other tools."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
                         "description": (
-                            "Get water body information for a location. "
-                            "RETURNS: Water feature names, types (river/canal/lake), "
-                            "widths, and managing water authorities. "
-                            "USE FOR: Questions about nearby water, flood risk context, "
-                            "or water management responsibilities."
+                            "Search term: location ID (e.g., 'LOC001'), feature name "
+                            "(e.g., 'Oudegracht'), or type (e.g., 'canal', 'cycleway')."
                         ),
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "location_id": {
-                                    "type": "string",
-                                    "description": "Location identifier (e.g., 'LOC001').",
-                                }
-                            },
-                            "required": ["location_id"],
-                        },
-                    },
-                ]
+                    }
+                },
+                "required": ["query"],
             },
-        }
+        },
+        {
+            "name": "get_terrain",
+            "description": (
+                "Get complete topographic information for a location including "
+                "terrain type, roads, and water bodies. "
+                "PREREQUISITE: Get locationId from BAG find_address or BGT find_area. "
+                "RETURNS: All BGT features at that location - areas with surface "
+                "types, roads with classifications, water bodies with types. "
+                "USE FOR: Understanding the physical environment of a location."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "location_id": {
+                        "type": "string",
+                        "description": "Location identifier (e.g., 'LOC001').",
+                    }
+                },
+                "required": ["location_id"],
+            },
+        },
+        {
+            "name": "get_roads",
+            "description": (
+                "Get road infrastructure information for a location. "
+                "RETURNS: Road names, types (highway/local/cycleway/footpath), "
+                "surface materials, and managing authorities. "
+                "USE FOR: Questions about road access, cycling infrastructure, "
+                "or who maintains the roads."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "location_id": {
+                        "type": "string",
+                        "description": "Location identifier (e.g., 'LOC001').",
+                    }
+                },
+                "required": ["location_id"],
+            },
+        },
+        {
+            "name": "get_water",
+            "description": (
+                "Get water body information for a location. "
+                "RETURNS: Water feature names, types (river/canal/lake), "
+                "widths, and managing water authorities. "
+                "USE FOR: Questions about nearby water, flood risk context, "
+                "or water management responsibilities."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "location_id": {
+                        "type": "string",
+                        "description": "Location identifier (e.g., 'LOC001').",
+                    }
+                },
+                "required": ["location_id"],
+            },
+        },
+    ]
+}
+
+
+def handle_initialize(request_id: Any, params: dict) -> dict:
+    """Answer the MCP initialize handshake"""
+    return {"jsonrpc": "2.0", "id": request_id, "result": _INITIALIZE_RESULT}
+
+
+def handle_tools_list(request_id: Any, params: dict) -> dict:
+    """List the tools this server provides"""
+    return {"jsonrpc": "2.0", "id": request_id, "result": _TOOLS_LIST_RESULT}
+
+
+def handle_tools_call(request_id: Any, params: dict) -> dict | None:
+    """Run a tool; None for an unknown tool"""
+    handler = _TOOL_HANDLERS.get(params.get("name"))
+    if handler is None:
+        return None
+    return {"jsonrpc": "2.0", "id": request_id, "result": handler(params.get("arguments", {}))}
+
+
+# JSON-RPC handlers by method name
+_METHOD_HANDLERS: dict[Any, Callable[[Any, dict], dict | None]] = {
+    "initialize": handle_initialize,
+    "tools/list": handle_tools_list,
+    "tools/call": handle_tools_call,
+}
+
+
+def handle_request(request: dict) -> dict:
+    """Handle MCP JSON-RPC request"""
+    method = request.get("method")
+    request_id = request.get("id")
 
-    elif method == "tools/call":
-        tool_name = params.get("name")
-        tool_args = params.get("arguments", {})
-
-        if tool_name == "find_area":
-            query = tool_args.get("query", "")
-            result = find_area(query)
-
-            if not result.get("@graph"):
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": (
-                                    f"No topographic features found matching '{query}'. "
-                                    "Try searching by location ID, feature name, or type "
-                                    "(e.g., 'canal', 'cycleway', 'LOC001')."
-                                ),
-                            }
-                        ],
-                    },
-                }
-
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
-
-        elif tool_name == "get_terrain":
-            location_id = tool_args.get("location_id")
-            result = get_terrain(location_id)
-
-            if result is None:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"No topographic data found for location {location_id}",
-                            }
-                        ],
-                        "isError": True,
-                    },
-                }
-
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
-
-        elif tool_name == "get_roads":
-            location_id = tool_args.get("location_id")
-            result = get_roads(location_id)
-
-            if result is None:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"No road data found for location {location_id}",
-                            }
-                        ],
-                        "isError": True,
-                    },
-                }
-
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
-
-        elif tool_name == "get_water":
-            location_id = tool_args.get("location_id")
-            result = get_water(location_id)
-
-            if result is None:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"No water body data found for location {location_id}",
-                            }
-                        ],
-                        "isError": True,
-                    },
-                }
-
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
+    handler = _METHOD_HANDLERS.get(method)
+    response = handler(request_id, request.get("params", {})) if handler else None
+    if response is not None:
+        return response
 
     # Unknown method
     return {
@@ -564,20 +634,109 @@ def handle_request(request):
     }
 
 
+# Longest JSON-RPC request line accepted on stdin
+MAX_REQUEST_BYTES = 1024 * 1024
+
+
+def error_response(code: int, message: str) -> dict:
+    """Build a JSON-RPC error response for a request that could not be handled"""
+    return {"jsonrpc": "2.0", "id": None, "error": {"code": code, "message": message}}
+
+
+def parse_request(line: bytes) -> tuple[dict | None, dict | None]:
+    """
+    Parse one request line
+
+    Returns:
+        A (request, error response) pair of which exactly one is set
+    """
+    try:
+        request = orjson.loads(line)
+    except orjson.JSONDecodeError as e:
+        return None, error_response(-32700, f"Parse error: {e}")
+
+    if not isinstance(request, dict):
+        return None, error_response(-32600, "Request must be a JSON object")
+    return request, None
+
+
+def write_response(out, response):
+    """Write one JSON-RPC response as a single newline-terminated frame"""
+    try:
+        data = orjson.dumps(response, option=orjson.OPT_APPEND_NEWLINE)
+    except orjson.JSONEncodeError as e:
+        data = orjson.dumps(error_response(-32603, str(e)), option=orjson.OPT_APPEND_NEWLINE)
+    # One buffered write and flush per message, so each reaches the pipe in one syscall
+    out.write(data)
+    out.flush()
+
+
+async def read_frames(reader):
+    """
+    Yield the request lines from stdin as they arrive
+
+    Lines longer than MAX_REQUEST_BYTES are dropped without being buffered whole and yielded
+    as None.
+    """
+    while True:
+        try:
+            yield await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            # End of input; the last line may lack its newline
+            if e.partial:
+                yield e.partial
+            return
+        except asyncio.LimitOverrunError as e:
+            # Discard up to the end of the oversized line, which may not have arrived yet
+            await reader.readexactly(e.consumed)
+            while True:
+                try:
+                    await reader.readuntil(b"\n")
+                    break
+                except asyncio.LimitOverrunError as rest:
+                    await reader.readexactly(rest.consumed)
+                except asyncio.IncompleteReadError:
+                    break
+            yield None
+
+
+async def serve():
+    """Read JSON-RPC requests from stdin and answer them on stdout, in order"""
+    loop = asyncio.get_running_loop()
+    # Read and write bytes directly, skipping the text layer's decoding and encoding
+    out = sys.stdout.buffer
+
+    # The loop reads stdin without blocking as data arrives, so requests a client pipelines
+    # are already buffered while earlier ones are answered. Regular files (e.g.
+    # `server.py < requests.jsonl`) cannot be watched by the loop and are read directly.
+    if stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode):
+        reader = asyncio.StreamReader(limit=MAX_REQUEST_BYTES)
+        reader.feed_data(sys.stdin.buffer.read())
+        reader.feed_eof()
+    else:
+        reader = asyncio.StreamReader(limit=MAX_REQUEST_BYTES)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer)
+
+    # The tools are pure in-memory lookups, so each request is answered inline on the loop
+    # thread; handing it to a worker thread would cost more than the lookup itself
+    async for line in read_frames(reader):
+        if line is None:
+            response = error_response(-32600, f"Request exceeds {MAX_REQUEST_BYTES} bytes")
+        else:
+            # Only parsing is expected to fail; a handler error is a bug, but it is still
+            # answered so the client isn't left waiting for a reply
+            request, response = parse_request(line)
+            if request is not None:
+                try:
+                    response = handle_request(request)
+                except Exception as e:
+                    response = error_response(-32603, str(e))
+        write_response(out, response)
+
+
 def main():
     """Main MCP server loop using stdio transport"""
-    for line in sys.stdin:
-        try:
-            request = json.loads(line)
-            response = handle_request(request)
-            print(json.dumps(response), flush=True)
-        except Exception as e:
-            error_response = {
-                "jsonrpc": "2.0",
-                "id": None,
-                "error": {"code": -32603, "message": str(e)},
-            }
-            print(json.dumps(error_response), flush=True)
+    asyncio.run(serve())
 
 
 if __name__ == "__main__":
@@ -45,506 +45,591 @@ Cross-Service Linking:
 Response Format: JSON-LD with @context for semantic interoperability
 """
 
-import json
+import bisect
+import functools
+import os
 import sys
+from dataclasses import dataclass
+
+import orjson
+
+# BRT sample data: geographic names
+NAMES = [
+    # (locationId, nameId, placeName, placeType, language)
+    ("LOC001", "BRT-N001", "Amsterdam", "city", "nl"),
+    ("LOC001", "BRT-N002", "De Wallen", "neighborhood", "nl"),
+    ("LOC001", "BRT-N003", "Dam", "landmark", "nl"),
+    ("LOC002", "BRT-N004", "Utrecht", "city", "nl"),
+    ("LOC002", "BRT-N005", "Binnenstad", "neighborhood", "nl"),
+    ("LOC003", "BRT-N006", "Rotterdam", "city", "nl"),
+    ("LOC003", "BRT-N007", "Centrum", "neighborhood", "nl"),
+    ("LOC004", "BRT-N008", "Groningen", "city", "nl"),
+    ("LOC004", "BRT-N009", "Grunnen", "city", "fy"),  # Gronings dialect name
+    ("LOC005", "BRT-N010", "Eindhoven", "city", "nl"),
+    ("LOC005", "BRT-N011", "Centrum", "neighborhood", "nl"),
+]
+
+# Administrative boundaries
+BOUNDARIES = [
+    # (locationId, boundaryId, municipality, province, waterBoard, safetyRegion)
+    (
+        "LOC001",
+        "BRT-B001",
+        "Amsterdam",
+        "Noord-Holland",
+        "Amstel, Gooi en Vecht",
+        "Amsterdam-Amstelland",
+    ),
+    ("LOC002", "BRT-B002", "Utrecht", "Utrecht", "De Stichtse Rijnlanden", "Utrecht"),
+    (
+        "LOC003",
+        "BRT-B003",
+        "Rotterdam",
+        "Zuid-Holland",
+        "Hollandse Delta",
+        "Rotterdam-Rijnmond",
+    ),
+    ("LOC004", "BRT-B004", "Groningen", "Groningen", "Noorderzijlvest", "Groningen"),
+    ("LOC005", "BRT-B005", "Eindhoven", "Noord-Brabant", "De Dommel", "Brabant-Zuidoost"),
+]
+
+# Landscape features
+FEATURES = [
+    # (locationId, featureId, featureType, featureName, areaHectares)
+    ("LOC001", "BRT-F001", "park", "Vondelpark", 47.0),
+    ("LOC001", "BRT-F002", "park", "Artis", 14.0),
+    ("LOC002", "BRT-F003", "park", "Park Lepelenburg", 3.5),
+    ("LOC002", "BRT-F004", "forest", "Amelisweerd", 85.0),
+    ("LOC003", "BRT-F005", "park", "Het Park", 26.0),
+    ("LOC003", "BRT-F006", "park", "Kralingse Bos", 200.0),
+    ("LOC004", "BRT-F007", "park", "Noorderplantsoen", 17.0),
+    ("LOC004", "BRT-F008", "park", "Stadspark", 30.0),
+    ("LOC005", "BRT-F009", "park", "Stadswandelpark", 15.0),
+    ("LOC005", "BRT-F010", "forest", "Philips de Jongh Wandelpark", 22.0),
+]
+
+_CONTEXT = {"geo": "http://imx-geo-prime.org/geospatial#"}
+
+# JSON-LD @type of each record kind, shared by all entries of that kind
+TYPE_NAME = sys.intern("geo:GeographicName")
+TYPE_BOUNDARY = sys.intern("geo:AdministrativeBoundary")
+TYPE_FEATURE = sys.intern("geo:LandscapeFeature")
+
+# Tool results are compact JSON; BRT_PRETTY=1 indents them for reading by hand
+_PRETTY_JSON = os.environ.get("BRT_PRETTY", "0").lower() in ("1", "true", "yes")
+_JSON_OPTIONS = orjson.OPT_INDENT_2 if _PRETTY_JSON else 0
+
+
+@dataclass(slots=True, frozen=True)
+class PlaceName:
+    """A geographic name of a location"""
+
+    location_id: str
+    name_id: str
+    place_name: str
+    place_type: str
+    language: str
+
+    def search_fields(self):
+        """Values find_place matches the query against"""
+        return (self.location_id, self.place_name, self.place_type)
+
+    def summary(self):
+        """JSON-LD entry in find_place results"""
+        return {
+            "@type": TYPE_NAME,
+            "geo:locationId": self.location_id,
+            "geo:nameId": self.name_id,
+            "geo:placeName": self.place_name,
+            "geo:placeType": self.place_type,
+            "geo:language": self.language,
+        }
 
-from rdflib import Graph, Literal, Namespace, URIRef
-from rdflib.namespace import RDF, XSD
-
-# Define namespace
-GEO = Namespace("http://imx-geo-prime.org/geospatial#")
-
-# Initialize in-memory RDF graph
-graph = Graph()
-graph.bind("geo", GEO)
-
-
-def init_data():
-    """Initialize BRT sample data for topographic features"""
-
-    # Geographic names
-    names = [
-        # (locationId, nameId, placeName, placeType, language)
-        ("LOC001", "BRT-N001", "Amsterdam", "city", "nl"),
-        ("LOC001", "BRT-N002", "De Wallen", "neighborhood", "nl"),
-        ("LOC001", "BRT-N003", "Dam", "landmark", "nl"),
-        ("LOC002", "BRT-N004", "Utrecht", "city", "nl"),
-        ("LOC002", "BRT-N005", "Binnenstad", "neighborhood", "nl"),
-        ("LOC003", "BRT-N006", "Rotterdam", "city", "nl"),
-        ("LOC003", "BRT-N007", "Centrum", "neighborhood", "nl"),
-        ("LOC004", "BRT-N008", "Groningen", "city", "nl"),
-        ("LOC004", "BRT-N009", "Grunnen", "city", "fy"),  # Gronings dialect name
-        ("LOC005", "BRT-N010", "Eindhoven", "city", "nl"),
-        ("LOC005", "BRT-N011", "Centrum", "neighborhood", "nl"),
-    ]
+    def details(self):
+        """JSON-LD entry in the results for one location"""
+        return {
+            "@type": TYPE_NAME,
+            "geo:nameId": self.name_id,
+            "geo:placeName": self.place_name,
+            "geo:placeType": self.place_type,
+            "geo:language": self.language,
+        }
 
-    # Administrative boundaries
-    boundaries = [
-        # (locationId, boundaryId, municipality, province, waterBoard, safetyRegion)
-        (
-            "LOC001",
-            "BRT-B001",
-            "Amsterdam",
-            "Noord-Holland",
-            "Amstel, Gooi en Vecht",
-            "Amsterdam-Amstelland",
-        ),
-        ("LOC002", "BRT-B002", "Utrecht", "Utrecht", "De Stichtse Rijnlanden", "Utrecht"),
-        (
-            "LOC003",
-            "BRT-B003",
-            "Rotterdam",
-            "Zuid-Holland",
-            "Hollandse Delta",
-            "Rotterdam-Rijnmond",
-        ),
-        ("LOC004", "BRT-B004", "Groningen", "Groningen", "Noorderzijlvest", "Groningen"),
-        ("LOC005", "BRT-B005", "Eindhoven", "Noord-Brabant", "De Dommel", "Brabant-Zuidoost"),
-    ]
 
-    # Landscape features
-    features = [
-        # (locationId, featureId, featureType, featureName, areaHectares)
-        ("LOC001", "BRT-F001", "park", "Vondelpark", 47.0),
-        ("LOC001", "BRT-F002", "park", "Artis", 14.0),
-        ("LOC002", "BRT-F003", "park", "Park Lepelenburg", 3.5),
-        ("LOC002", "BRT-F004", "forest", "Amelisweerd", 85.0),
-        ("LOC003", "BRT-F005", "park", "Het Park", 26.0),
-        ("LOC003", "BRT-F006", "park", "Kralingse Bos", 200.0),
-        ("LOC004", "BRT-F007", "park", "Noorderplantsoen", 17.0),
-        ("LOC004", "BRT-F008", "park", "Stadspark", 30.0),
-        ("LOC005", "BRT-F009", "park", "Stadswandelpark", 15.0),
-        ("LOC005", "BRT-F010", "forest", "Philips de Jongh Wandelpark", 22.0),
-    ]
+@dataclass(slots=True, frozen=True)
+class Boundary:
+    """The administrative division a location belongs to"""
 
-    # Add names to graph
-    for loc_id, name_id, place_name, place_type, language in names:
-        name_uri = URIRef(f"http://imx-geo-prime.org/brt/names/{name_id}")
+    location_id: str
+    boundary_id: str
+    municipality: str
+    province: str
+    water_board: str
+    safety_region: str
 
-        graph.add((name_uri, RDF.type, GEO.GeographicName))
-        graph.add((name_uri, GEO.locationId, Literal(loc_id)))
-        graph.add((name_uri, GEO.nameId, Literal(name_id)))
-        graph.add((name_uri, GEO.placeName, Literal(place_name)))
-        graph.add((name_uri, GEO.placeType, Literal(place_type)))
-        graph.add((name_uri, GEO.language, Literal(language)))
+    def summary(self):
+        """JSON-LD entry in list_municipalities results"""
+        return {
+            "@type": TYPE_BOUNDARY,
+            "geo:locationId": self.location_id,
+            "geo:municipality": self.municipality,
+            "geo:province": self.province,
+        }
 
-    # Add boundaries to graph
-    for loc_id, bound_id, municipality, province, water_board, safety_region in boundaries:
-        boundary_uri = URIRef(f"http://imx-geo-prime.org/brt/boundaries/{bound_id}")
+    def details(self):
+        """JSON-LD document returned by get_boundaries"""
+        return {
+            "@context": _CONTEXT,
+            "@id": f"http://imx-geo-prime.org/brt/boundaries/{self.boundary_id}",
+            "@type": TYPE_BOUNDARY,
+            "geo:locationId": self.location_id,
+            "geo:boundaryId": self.boundary_id,
+            "geo:municipality": self.municipality,
+            "geo:province": self.province,
+            "geo:waterBoard": self.water_board,
+            "geo:safetyRegion": self.safety_region,
+        }
 
-        graph.add((boundary_uri, RDF.type, GEO.AdministrativeBoundary))
-        graph.add((boundary_uri, GEO.locationId, Literal(loc_id)))
-        graph.add((boundary_uri, GEO.boundaryId, Literal(bound_id)))
-        graph.add((boundary_uri, GEO.municipality, Literal(municipality)))
-        graph.add((boundary_uri, GEO.province, Literal(province)))
-        graph.add((boundary_uri, GEO.waterBoard, Literal(water_board)))
-        graph.add((boundary_uri, GEO.safetyRegion, Literal(safety_region)))
 
-    # Add landscape features to graph
-    for loc_id, feature_id, feature_type, feature_name, area in features:
-        feature_uri = URIRef(f"http://imx-geo-prime.org/brt/features/{feature_id}")
+@dataclass(slots=True, frozen=True)
+class LandscapeFeature:
+    """A park, forest or other landscape element near a location"""
 
-        graph.add((feature_uri, RDF.type, GEO.LandscapeFeature))
-        graph.add((feature_uri, GEO.locationId, Literal(loc_id)))
-        graph.add((feature_uri, GEO.featureId, Literal(feature_id)))
-        graph.add((feature_uri, GEO.featureType, Literal(feature_type)))
-        graph.add((feature_uri, GEO.featureName, Literal(feature_name)))
-        graph.add((feature_uri, GEO.areaHectares, Literal(area, datatype=XSD.decimal)))
+    location_id: str
+    feature_id: str
+    feature_type: str
+    feature_name: str
+    area_hectares: str
 
+    def search_fields(self):
+        """Values find_place matches the query against"""
+        return (self.location_id, self.feature_name, self.feature_type)
+
+    def summary(self):
+        """JSON-LD entry in find_place results"""
+        return {
+            "@type": TYPE_FEATURE,
+            "geo:locationId": self.location_id,
+            "geo:featureId": self.feature_id,
+            "geo:featureName": self.feature_name,
+            "geo:featureType": self.feature_type,
+        }
+
+    def details(self):
+        """JSON-LD entry in the results for one location"""
+        return {
+            "@type": TYPE_FEATURE,
+            "geo:featureId": self.feature_id,
+            "geo:featureName": self.feature_name,
+            "geo:featureType": self.feature_type,
+            "geo:areaHectares": self.area_hectares,
+        }
 
-init_data()
+
+# Lookup tables built once at startup; the data is read-only, so the tools serve these
+# instead of scanning the sample data on every call. JSON-LD dicts are only built for
+# responses; apart from the get_boundaries documents the tables hold the records themselves
+NAMES_ALL: list[PlaceName] = []  # records per kind, in data order
+FEATURES_ALL: list[LandscapeFeature] = []
+BOUNDARIES_ALL: list[Boundary] = []
+NAMES_BY_LOC: dict[str, list[PlaceName]] = {}  # records by locationId
+FEATURES_BY_LOC: dict[str, list[LandscapeFeature]] = {}
+BOUNDARY_BY_LOC: dict[str, dict] = {}  # get_boundaries documents by locationId (first wins)
+MUNICIPALITIES: dict = {}  # the list_municipalities payload
+# Records of both kinds in find_place result order, with their lowercased searchable fields.
+# The fields are joined with NUL so a query can't match across field boundaries
+_SEARCH_RECORDS: list[PlaceName | LandscapeFeature] = []
+_SEARCH_BLOBS: list[str] = []
+# Positions in _SEARCH_BLOBS by each three-character substring of a searchable field
+_TRIGRAMS: dict[str, set[int]] = {}
+# Offset of each search blob in _SEARCH_TEXT, plus one past the end
+_BLOB_STARTS: list[int] = []
+
+
+def _interned(rows):
+    """Return the rows with their string values interned"""
+    return [tuple(sys.intern(v) if isinstance(v, str) else v for v in row) for row in rows]
+
+
+def build_indexes():
+    """Index the geographic names, boundaries and landscape features by location ID"""
+    for loc_id, name_id, place_name, place_type, language in _interned(NAMES):
+        name = PlaceName(loc_id, name_id, place_name, place_type, language)
+        NAMES_ALL.append(name)
+        NAMES_BY_LOC.setdefault(loc_id, []).append(name)
+
+    BOUNDARIES_ALL.extend(Boundary(*row) for row in _interned(BOUNDARIES))
+
+    # The areas are rendered as text, as the JSON-LD output has always had them
+    for loc_id, feature_id, feature_type, feature_name, area in _interned(FEATURES):
+        feature = LandscapeFeature(loc_id, feature_id, feature_type, feature_name, str(area))
+        FEATURES_ALL.append(feature)
+        FEATURES_BY_LOC.setdefault(loc_id, []).append(feature)
+
+    for boundary in BOUNDARIES_ALL:
+        BOUNDARY_BY_LOC.setdefault(boundary.location_id, boundary.details())
+    MUNICIPALITIES.update(
+        {"@context": _CONTEXT, "@graph": [boundary.summary() for boundary in BOUNDARIES_ALL]}
+    )
+
+    _SEARCH_RECORDS.extend(NAMES_ALL + FEATURES_ALL)
+    offset = 0
+    for position, record in enumerate(_SEARCH_RECORDS):
+        blob = "\x00".join(record.search_fields()).lower()
+        _SEARCH_BLOBS.append(blob)
+        _BLOB_STARTS.append(offset)
+        offset += len(blob) + 1
+        for field in blob.split("\x00"):
+            for start in range(len(field) - 2):
+                _TRIGRAMS.setdefault(field[start : start + 3], set()).add(position)
+    _BLOB_STARTS.append(offset)
+
+
+build_indexes()
+
+# All search blobs joined with NUL into one string, so a short query is located with one
+# str.find per hit instead of a substring test per entry
+_SEARCH_TEXT = "\x00".join(_SEARCH_BLOBS)
+
+
+def _match_search_text(query_lower):
+    """Return the positions of the search blobs containing the query, in order"""
+    if "\x00" in query_lower:
+        # NUL only separates fields, no field contains it
+        return []
+
+    if len(query_lower) < 3:
+        return list(_scan_search_text(query_lower))
+
+    # Only entries holding every trigram of the query can contain it; the substring test
+    # below still decides, as trigrams don't capture their order
+    postings: list[set[int]] = [
+        _TRIGRAMS.get(query_lower[start : start + 3], set())
+        for start in range(len(query_lower) - 2)
+    ]
+    postings.sort(key=len)
+    positions = sorted(postings[0].intersection(*postings[1:]))
+    return [i for i in positions if query_lower in _SEARCH_BLOBS[i]]
+
+
+def _scan_search_text(query_lower):
+    """Yield the positions of the search blobs containing the query, in order"""
+    hit = _SEARCH_TEXT.find(query_lower)
+    while hit >= 0:
+        position = bisect.bisect_right(_BLOB_STARTS, hit) - 1
+        yield position
+        # Resume at the next blob, so each entry is reported once
+        hit = _SEARCH_TEXT.find(query_lower, _BLOB_STARTS[position + 1])
+
+
+# find_place matches for each location ID and place or feature type (lowercased), the most
+# common queries; computed by the general search so that a term which is part of a longer ID
+# or a name still finds both
+_FIND_BY_TERM = {
+    term: _match_search_text(term)
+    for term in {
+        field.lower()
+        for record in _SEARCH_RECORDS
+        # search_fields() ends with the place or feature type
+        for field in (record.location_id, record.search_fields()[-1])
+    }
+}
 
 
 def find_place(query):
     """Find places by name, type, or location ID"""
     query_lower = query.lower()
-    results = []
-
-    # Search in geographic names
-    for name_uri in graph.subjects(RDF.type, GEO.GeographicName):
-        loc_id = str(graph.value(name_uri, GEO.locationId))
-        place_name = str(graph.value(name_uri, GEO.placeName))
-        place_type = str(graph.value(name_uri, GEO.placeType))
-
-        if (
-            query_lower in loc_id.lower()
-            or query_lower in place_name.lower()
-            or query_lower in place_type.lower()
-        ):
-            results.append(
-                {
-                    "@type": "geo:GeographicName",
-                    "geo:locationId": loc_id,
-                    "geo:nameId": str(graph.value(name_uri, GEO.nameId)),
-                    "geo:placeName": place_name,
-                    "geo:placeType": place_type,
-                    "geo:language": str(graph.value(name_uri, GEO.language)),
-                }
-            )
-
-    # Search in landscape features
-    for feature_uri in graph.subjects(RDF.type, GEO.LandscapeFeature):
-        loc_id = str(graph.value(feature_uri, GEO.locationId))
-        feature_name = str(graph.value(feature_uri, GEO.featureName))
-        feature_type = str(graph.value(feature_uri, GEO.featureType))
-
-        if (
-            query_lower in loc_id.lower()
-            or query_lower in feature_name.lower()
-            or query_lower in feature_type.lower()
-        ):
-            results.append(
-                {
-                    "@type": "geo:LandscapeFeature",
-                    "geo:locationId": loc_id,
-                    "geo:featureId": str(graph.value(feature_uri, GEO.featureId)),
-                    "geo:featureName": feature_name,
-                    "geo:featureType": feature_type,
-                }
-            )
-
-    return {"@context": {"geo": "http://imx-geo-prime.org/geospatial#"}, "@graph": results}
+
+    # Names and features both match on location ID, name and type
+    if not query_lower:
+        # Every field contains the empty string
+        positions = range(len(_SEARCH_RECORDS))
+    else:
+        positions = _FIND_BY_TERM.get(query_lower)
+        if positions is None:
+            positions = _match_search_text(query_lower)
+    return {"@context": _CONTEXT, "@graph": [_SEARCH_RECORDS[i].summary() for i in positions]}
 
 
 def get_boundaries(location_id):
     """Get administrative boundary information for a location"""
-    boundary_uri = None
-    for boundary in graph.subjects(RDF.type, GEO.AdministrativeBoundary):
-        if str(graph.value(boundary, GEO.locationId)) == location_id:
-            boundary_uri = boundary
-            break
-
-    if not boundary_uri:
-        return None
-
-    return {
-        "@context": {"geo": "http://imx-geo-prime.org/geospatial#"},
-        "@id": str(boundary_uri),
-        "@type": "geo:AdministrativeBoundary",
-        "geo:locationId": location_id,
-        "geo:boundaryId": str(graph.value(boundary_uri, GEO.boundaryId)),
-        "geo:municipality": str(graph.value(boundary_uri, GEO.municipality)),
-        "geo:province": str(graph.value(boundary_uri, GEO.province)),
-        "geo:waterBoard": str(graph.value(boundary_uri, GEO.waterBoard)),
-        "geo:safetyRegion": str(graph.value(boundary_uri, GEO.safetyRegion)),
-    }
+    return BOUNDARY_BY_LOC.get(location_id)
 
 
 def get_place_names(location_id):
     """Get all geographic names for a location"""
-    names = []
-
-    for name_uri in graph.subjects(RDF.type, GEO.GeographicName):
-        if str(graph.value(name_uri, GEO.locationId)) == location_id:
-            names.append(
-                {
-                    "@type": "geo:GeographicName",
-                    "geo:nameId": str(graph.value(name_uri, GEO.nameId)),
-                    "geo:placeName": str(graph.value(name_uri, GEO.placeName)),
-                    "geo:placeType": str(graph.value(name_uri, GEO.placeType)),
-                    "geo:language": str(graph.value(name_uri, GEO.language)),
-                }
-            )
-
+    names = NAMES_BY_LOC.get(location_id)
     if not names:
         return None
 
     return {
-        "@context": {"geo": "http://imx-geo-prime.org/geospatial#"},
+        "@context": _CONTEXT,
         "geo:locationId": location_id,
-        "@graph": names,
+        "@graph": [name.details() for name in names],
     }
 
 
 def get_landscape(location_id):
     """Get landscape features for a location"""
-    features = []
-
-    for feature_uri in graph.subjects(RDF.type, GEO.LandscapeFeature):
-        if str(graph.value(feature_uri, GEO.locationId)) == location_id:
-            features.append(
-                {
-                    "@type": "geo:LandscapeFeature",
-                    "geo:featureId": str(graph.value(feature_uri, GEO.featureId)),
-                    "geo:featureName": str(graph.value(feature_uri, GEO.featureName)),
-                    "geo:featureType": str(graph.value(feature_uri, GEO.featureType)),
-                    "geo:areaHectares": str(graph.value(feature_uri, GEO.areaHectares)),
-                }
-            )
-
+    features = FEATURES_BY_LOC.get(location_id)
     if not features:
         return None
 
     return {
-        "@context": {"geo": "http://imx-geo-prime.org/geospatial#"},
+        "@context": _CONTEXT,
         "geo:locationId": location_id,
-        "@graph": features,
+        "@graph": [feature.details() for feature in features],
     }
 
 
 def list_municipalities():
     """List all municipalities with their administrative info"""
-    municipalities = []
-
-    for boundary_uri in graph.subjects(RDF.type, GEO.AdministrativeBoundary):
-        municipalities.append(
-            {
-                "@type": "geo:AdministrativeBoundary",
-                "geo:locationId": str(graph.value(boundary_uri, GEO.locationId)),
-                "geo:municipality": str(graph.value(boundary_uri, GEO.municipality)),
-                "geo:province": str(graph.value(boundary_uri, GEO.province)),
-            }
+    return MUNICIPALITIES
+
+
+def _text_result(text, is_error=False):
+    """Build an MCP tools/call result holding one text item"""
+    result = {"content": [{"type": "text", "text": text}]}
+    if is_error:
+        result["isError"] = True
+    return result
+
+
+def _json_result(value):
+    """Build an MCP tools/call result holding value as JSON text"""
+    return _text_result(orjson.dumps(value, option=_JSON_OPTIONS).decode())
+
+
+def _not_found_result(kind, location_id):
+    """Build the error result for a location without data of the given kind"""
+    return _text_result(f"No {kind} found for location {location_id}", is_error=True)
+
+
+def find_place_result(query):
+    """Build the MCP result of find_place"""
+    result = find_place(query)
+
+    if not result["@graph"]:
+        return _text_result(
+            f"No places found matching '{query}'. "
+            "Try searching by city name, neighborhood, or feature type "
+            "(e.g., 'park', 'city', 'neighborhood')."
         )
 
-    return {"@context": {"geo": "http://imx-geo-prime.org/geospatial#"}, "@graph": municipalities}
+    return _json_result(result)
 
 
-def handle_request(request):
-    """Handle MCP JSON-RPC request"""
-    method = request.get("method")
-    params = request.get("params", {})
-    request_id = request.get("id")
+@functools.lru_cache(maxsize=512)
+def get_boundaries_result(location_id):
+    """Build the MCP result of get_boundaries"""
+    result = get_boundaries(location_id)
 
-    if method == "initialize":
-        return {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "result": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {"tools": {}},
-                "serverInfo": {
-                    "name": "brt-service",
-                    "version": "1.0.0",
-                    "description": (
-                        "BRT (Basisregistratie Topografie) MCP Server. "
-                        "Provides topographic map data at 1:10,000 and smaller scales "
-                        "including place names, administrative boundaries, and landscape "
-                        "features. Data source: Kadaster/PDOK BRT (pdok.nl/brt). "
-                        "Use this service for questions about: place names, neighborhoods, "
-                        "provinces, municipalities, water boards, safety regions, "
-                        "parks, forests, and other landscape features."
-                    ),
-                },
-            },
-        }
+    if result is None:
+        return _not_found_result("boundary data", location_id)
 
-    elif method == "tools/list":
-        return {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "result": {
-                "tools": [
-                    {
-                        "name": "find_place",
-                        "description": (
-                            "Search for places by name, type, or location ID. "
-                            "USE THIS to discover locations and geographic features. "
-                            "Searches place names, neighborhoods, landmarks, parks, forests. "
-                            "EXAMPLE: find_place('Amsterdam') returns Amsterdam and its "
-                            "neighborhoods. EXAMPLE: find_place('park') returns all parks. "
-                            "Returns locationId values for use with other tools."
-                        ),
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "query": {
-                                    "type": "string",
-                                    "description": (
-                                        "Search term: place name, location ID, or type "
-                                        "(city/neighborhood/landmark/park/forest)."
-                                    ),
-                                }
-                            },
-                            "required": ["query"],
-                        },
-                    },
-                    {
-                        "name": "get_boundaries",
-                        "description": (
-                            "Get administrative boundary information for a location. "
-                            "RETURNS: Municipality (gemeente), province (provincie), "
-                            "water board (waterschap), and safety region (veiligheidsregio). "
-                            "USE FOR: Understanding which authorities have jurisdiction "
-                            "over a location, or finding administrative hierarchy."
-                        ),
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "location_id": {
-                                    "type": "string",
-                                    "description": "Location identifier (e.g., 'LOC001').",
-                                }
-                            },
-                            "required": ["location_id"],
-                        },
-                    },
-                    {
-                        "name": "get_place_names",
-                        "description": (
-                            "Get all geographic names associated with a location. "
-                            "RETURNS: City name, neighborhood names, landmarks, with "
-                            "language codes (nl for Dutch, fy for Frisian). "
-                            "USE FOR: Finding official names for places, or discovering "
-                            "what neighborhoods are in an area."
-                        ),
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "location_id": {
-                                    "type": "string",
-                                    "description": "Location identifier (e.g., 'LOC001').",
-                                }
-                            },
-                            "required": ["location_id"],
-                        },
-                    },
-                    {
-                        "name": "get_landscape",
-                        "description": (
-                            "Get landscape features (parks, forests, etc.) near a location. "
-                            "RETURNS: Feature name, type (park/forest/heath/dune/polder), "
-                            "and area in hectares. "
-                            "USE FOR: Finding green spaces, natural areas, or recreational "
-                            "areas near a location."
-                        ),
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "location_id": {
-                                    "type": "string",
-                                    "description": "Location identifier (e.g., 'LOC001').",
-                                }
-                            },
-                            "required": ["location_id"],
-                        },
-                    },
-                    {
-                        "name": "list_municipalities",
+    return _json_result(result)
+
+
+@functools.lru_cache(maxsize=512)
+def get_place_names_result(location_id):
+    """Build the MCP result of get_place_names"""
+    result = get_place_names(location_id)
+
+    if result is None:
+        return _not_found_result("place names", location_id)
+
+    return _json_result(result)
+
+
+@functools.lru_cache(maxsize=512)
+def get_landscape_result(location_id):
+    """Build the MCP result of get_landscape"""
+    result = get_landscape(location_id)
+
+    if result is None:
+        return _not_found_result("landscape features", location_id)
+
+    return _json_result(result)
+
+
+def warm_cache():
+    """Prebuild the get_* tool results for every location ID"""
+    location_ids = BOUNDARY_BY_LOC.keys() | NAMES_BY_LOC.keys() | FEATURES_BY_LOC.keys()
+    for location_id in sorted(location_ids):
+        get_boundaries_result(location_id)
+        get_place_names_result(location_id)
+        get_landscape_result(location_id)
+
+
+warm_cache()
+
+# list_municipalities takes no arguments and its data is static, so its MCP result (including
+# the serialized text) is built once
+_LIST_MUNICIPALITIES_RESULT = _json_result(list_municipalities())
+
+# tools/call handlers by tool name, each taking the call's arguments
+_TOOL_HANDLERS = {
+    "find_place": lambda args: find_place_result(args.get("query", "")),
+    "get_boundaries": lambda args: get_boundaries_result(args.get("location_id")),
+    "get_place_names": lambda args: get_place_names_result(args.get("location_id")),
+    "get_landscape": lambda args: get_landscape_result(args.get("location_id")),
+    "list_municipalities": lambda args: _LIST_MUNICIPALITIES_RESULT,
+}
+
+
+# The initialize and tools/list results never change, so they are built once
+_INITIALIZE_RESULT = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {"tools": {}},
+    "serverInfo": {
+        "name": "brt-service",
+        "version": "1.0.0",
+        "description": (
+            "BRT (Basisregistratie Topografie) MCP Server. "
+            "Provides topographic map data at 1:10,000 and smaller scales "
+            "including place names, administrative boundaries, and landscape "
+            "features. Data source: Kadaster/PDOK BRT (pdok.nl/brt). "
+            "Use this service for questions about: place names, neighborhoods, "
+            "provinces, municipalities, water boards, safety regions, "
+            "parks, forests, and other landscape features."
+        ),
+    },
+}
+
+_TOOLS_LIST_RESULT = {
+    "tools": [
+        {
+            "name": "find_place",
+            "description": (
+                "Search for places by name, type, or location ID. "
+                "USE THIS to discover locations and geographic features. "
+                "Searches place names, neighborhoods, landmarks, parks, forests. "
+                "EXAMPLE: find_place('Amsterdam') returns Amsterdam and its "
+                "neighborhoods. EXAMPLE: find_place('park') returns all parks. "
+                "Returns locationId values for use with other tools."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
                         "description": (
-                            "List all municipalities in the database with their provinces. "
-                            "USE THIS for an overview of available locations or to see "
-                            "what areas are covered. No parameters required."
+                            "Search term: place name, location ID, or type "
+                            "(city/neighborhood/landmark/park/forest)."
                         ),
-                        "inputSchema": {"type": "object", "properties": {}},
-                    },
-                ]
+                    }
+                },
+                "required": ["query"],
             },
-        }
+        },
+        {
+            "name": "get_boundaries",
+            "description": (
+                "Get administrative boundary information for a location. "
+                "RETURNS: Municipality (gemeente), province (provincie), "
+                "water board (waterschap), and safety region (veiligheidsregio). "
+                "USE FOR: Understanding which authorities have jurisdiction "
+                "over a location, or finding administrative hierarchy."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "location_id": {
+                        "type": "string",
+                        "description": "Location identifier (e.g., 'LOC001').",
+                    }
+                },
+                "required": ["location_id"],
+            },
+        },
+        {
+            "name": "get_place_names",
+            "description": (
+                "Get all geographic names associated with a location. "
+                "RETURNS: City name, neighborhood names, landmarks, with "
+                "language codes (nl for Dutch, fy for Frisian). "
+                "USE FOR: Finding official names for places, or discovering "
+                "what neighborhoods are in an area."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "location_id": {
+                        "type": "string",
+                        "description": "Location identifier (e.g., 'LOC001').",
+                    }
+                },
+                "required": ["location_id"],
+            },
+        },
+        {
+            "name": "get_landscape",
+            "description": (
+                "Get landscape features (parks, forests, etc.) near a location. "
+                "RETURNS: Feature name, type (park/forest/heath/dune/polder), "
+                "and area in hectares. "
+                "USE FOR: Finding green spaces, natural areas, or recreational "
+                "areas near a location."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "location_id": {
+                        "type": "string",
+                        "description": "Location identifier (e.g., 'LOC001').",
+                    }
+                },
+                "required": ["location_id"],
+            },
+        },
+        {
+            "name": "list_municipalities",
+            "description": (
+                "List all municipalities in the database with their provinces. "
+                "USE THIS for an overview of available locations or to see "
+                "what areas are covered. No parameters required."
+            ),
+            "inputSchema": {"type": "object", "properties": {}},
+        },
+    ]
+}
+
+
+def handle_initialize(request_id, params):
+    """Answer the MCP initialize handshake"""
+    return {"jsonrpc": "2.0", "id": request_id, "result": _INITIALIZE_RESULT}
 
-    elif method == "tools/call":
-        tool_name = params.get("name")
-        tool_args = params.get("arguments", {})
-
-        if tool_name == "find_place":
-            query = tool_args.get("query", "")
-            result = find_place(query)
-
-            if not result.get("@graph"):
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": (
-                                    f"No places found matching '{query}'. "
-                                    "Try searching by city name, neighborhood, or feature type "
-                                    "(e.g., 'park', 'city', 'neighborhood')."
-                                ),
-                            }
-                        ],
-                    },
-                }
-
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
-
-        elif tool_name == "get_boundaries":
-            location_id = tool_args.get("location_id")
-            result = get_boundaries(location_id)
-
-            if result is None:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"No boundary data found for location {location_id}",
-                            }
-                        ],
-                        "isError": True,
-                    },
-                }
-
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
-
-        elif tool_name == "get_place_names":
-            location_id = tool_args.get("location_id")
-            result = get_place_names(location_id)
-
-            if result is None:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"No place names found for location {location_id}",
-                            }
-                        ],
-                        "isError": True,
-                    },
-                }
-
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
-
-        elif tool_name == "get_landscape":
-            location_id = tool_args.get("location_id")
-            result = get_landscape(location_id)
-
-            if result is None:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"No landscape features found for location {location_id}",
-                            }
-                        ],
-                        "isError": True,
-                    },
-                }
-
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
-
-        elif tool_name == "list_municipalities":
-            result = list_municipalities()
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
+
+def handle_tools_list(request_id, params):
+    """List the tools this server provides"""
+    return {"jsonrpc": "2.0", "id": request_id, "result": _TOOLS_LIST_RESULT}
+
+
+def handle_tools_call(request_id, params):
+    """Run a tool; None for an unknown tool"""
+    handler = _TOOL_HANDLERS.get(params.get("name"))
+    if handler is None:
+        return None
+    return {"jsonrpc": "2.0", "id": request_id, "result": handler(params.get("arguments", {}))}
+
+
+# JSON-RPC handlers by method name
+_METHOD_HANDLERS = {
+    "initialize": handle_initialize,
+    "tools/list": handle_tools_list,
+    "tools/call": handle_tools_call,
+}
+
+
+def handle_request(request):
+    """Handle MCP JSON-RPC request"""
+    method = request.get("method")
+    request_id = request.get("id")
+
+    handler = _METHOD_HANDLERS.get(method)
+    response = handler(request_id, request.get("params", {})) if handler else None
+    if response is not None:
+        return response
 
     # Unknown method
     return {
@@ -554,20 +639,105 @@ def handle_request(request):
     }
 
 
+# Bytes requested from stdin per read; every request line in one read is answered in one flush
+READ_SIZE = 64 * 1024
+# Longest JSON-RPC request line accepted on stdin
+MAX_REQUEST_BYTES = 1024 * 1024
+
+
+def error_response(code, message):
+    """Build a JSON-RPC error response for a request that could not be handled"""
+    return {"jsonrpc": "2.0", "id": None, "error": {"code": code, "message": message}}
+
+
+def parse_request(line):
+    """
+    Parse one request line
+
+    Returns:
+        A (request, error response) pair of which exactly one is set
+    """
+    try:
+        request = orjson.loads(line)
+    except orjson.JSONDecodeError as e:
+        return None, error_response(-32700, f"Parse error: {e}")
+
+    if not isinstance(request, dict):
+        return None, error_response(-32600, "Request must be a JSON object")
+    return request, None
+
+
+def write_response(out, response):
+    """Write one JSON-RPC response as a newline-terminated frame; the caller flushes"""
+    try:
+        data = orjson.dumps(response, option=orjson.OPT_APPEND_NEWLINE)
+    except orjson.JSONEncodeError as e:
+        data = orjson.dumps(error_response(-32603, str(e)), option=orjson.OPT_APPEND_NEWLINE)
+    out.write(data)
+
+
+def read_batches(fd):
+    """
+    Yield the request lines from stdin, grouped by the read that completed them
+
+    A client that sends one request and waits gets a batch of one line; requests it
+    pipelines arrive together and form one batch. Lines longer than MAX_REQUEST_BYTES are
+    dropped without being buffered whole and yielded as None.
+    """
+    pending = bytearray()
+    # Set while the rest of an oversized line is skipped
+    discarding = False
+    while chunk := os.read(fd, READ_SIZE):
+        view = memoryview(chunk)
+        lines = []
+        start = 0
+        newline = chunk.find(b"\n")
+        while newline >= 0:
+            if discarding:
+                discarding = False
+            elif pending:
+                pending += view[start:newline]
+                too_long = len(pending) > MAX_REQUEST_BYTES
+                lines.append(None if too_long else bytes(pending))
+                pending.clear()
+            else:
+                lines.append(None if newline - start > MAX_REQUEST_BYTES else chunk[start:newline])
+            start = newline + 1
+            newline = chunk.find(b"\n", start)
+        if not discarding:
+            pending += view[start:]
+            if len(pending) > MAX_REQUEST_BYTES:
+                pending.clear()
+                discarding = True
+                lines.append(None)
+        if lines:
+            yield lines
+    # End of input; the last line may lack its newline
+    if pending:
+        yield [bytes(pending)]
+
+
 def main():
     """Main MCP server loop using stdio transport"""
-    for line in sys.stdin:
-        try:
-            request = json.loads(line)
-            response = handle_request(request)
-            print(json.dumps(response), flush=True)
-        except Exception as e:
-            error_response = {
-                "jsonrpc": "2.0",
-                "id": None,
-                "error": {"code": -32603, "message": str(e)},
-            }
-            print(json.dumps(error_response), flush=True)
+    # Read and write bytes directly, skipping the text layer's decoding and encoding
+    out = sys.stdout.buffer
+    for lines in read_batches(sys.stdin.fileno()):
+        for line in lines:
+            if line is None:
+                response = error_response(-32600, f"Request exceeds {MAX_REQUEST_BYTES} bytes")
+            else:
+                # Only parsing is expected to fail; a handler error is a bug, but it is still
+                # answered so the client isn't left waiting for a reply
+                request, response = parse_request(line)
+                if request is not None:
+                    try:
+                        response = handle_request(request)
+                    except Exception as e:
+                        response = error_response(-32603, str(e))
+            write_response(out, response)
+        # Flush once per batch, before blocking on the next read, so every request received so
+        # far is answered without a write syscall per response
+        out.flush()
 
 
 if __name__ == "__main__":
@@ -41,382 +41,355 @@ Cross-Service Linking:
 Response Format: JSON-LD with @context for semantic interoperability
 """
 
-import json
 import sys
 
-from rdflib import Graph, Literal, Namespace, URIRef
-from rdflib.namespace import RDF, XSD
-
-# Define namespace
-GEO = Namespace("http://imx-geo-prime.org/geospatial#")
-
-# Initialize in-memory RDF graph
-graph = Graph()
-graph.bind("geo", GEO)
-
-
-# Add sample CBS data (statistical and demographic information)
-def init_data():
-    statistics = [
-        # (locationId, municipality, population, households, avgIncome,
-        #  popDensity, unemploymentRate)
-        ("LOC001", "Amsterdam", 872680, 465242, 38500.0, 5135.0, 5.2),
-        ("LOC002", "Utrecht", 361966, 183149, 35200.0, 3426.0, 4.8),
-        ("LOC003", "Rotterdam", 651446, 342847, 31900.0, 3239.0, 6.5),
-    ]
-
-    for loc_id, municipality, pop, households, income, density, unemployment in statistics:
-        location_uri = URIRef(f"http://imx-geo-prime.org/locations/{loc_id}")
-        stats_uri = URIRef(f"http://imx-geo-prime.org/statistics/{loc_id}")
+import orjson
+
+# CBS sample data: statistical and demographic information per municipality
+STATISTICS = [
+    # (locationId, municipality, population, households, avgIncome,
+    #  popDensity, unemploymentRate)
+    ("LOC001", "Amsterdam", 872680, 465242, 38500.0, 5135.0, 5.2),
+    ("LOC002", "Utrecht", 361966, 183149, 35200.0, 3426.0, 4.8),
+    ("LOC003", "Rotterdam", 651446, 342847, 31900.0, 3239.0, 6.5),
+]
+
+CONTEXT = {"geo": "http://imx-geo-prime.org/geospatial#"}
+
+# Statistics by locationId, built once at startup; the data is read-only, so the tools look
+# records up here instead of matching triple patterns on every call
+STATS: dict[str, dict] = {}
+# find_location entries in data order, each with its lowercased municipality name and location
+# ID joined by NUL, so a query can't match across the two fields
+_SEARCH_INDEX: list[tuple[str, dict]] = []
+
+
+def build_indexes():
+    """Index the municipal statistics by location ID"""
+    for loc_id, municipality, pop, households, income, density, unemployment in STATISTICS:
+        STATS[loc_id] = {
+            "@id": f"http://imx-geo-prime.org/statistics/{loc_id}",
+            "municipality": municipality,
+            "population": pop,
+            "households": households,
+            "averageIncome": income,
+            "populationDensity": density,
+            "unemploymentRate": unemployment,
+        }
+        _SEARCH_INDEX.append(
+            (
+                "\x00".join((municipality, loc_id)).lower(),
+                {
+                    "@type": "geo:Municipality",
+                    "geo:locationId": loc_id,
+                    "geo:municipality": municipality,
+                    "geo:population": str(pop),
+                },
+            )
+        )
 
-        # Location data
-        graph.add((location_uri, RDF.type, GEO.Location))
-        graph.add((location_uri, GEO.locationId, Literal(loc_id)))
-        graph.add((location_uri, GEO.municipality, Literal(municipality)))
 
-        # Statistical data
-        graph.add((stats_uri, RDF.type, GEO.Municipality))
-        graph.add((stats_uri, GEO.locationId, Literal(loc_id)))
-        graph.add((stats_uri, GEO.municipality, Literal(municipality)))
-        graph.add((stats_uri, GEO.population, Literal(pop, datatype=XSD.integer)))
-        graph.add((stats_uri, GEO.households, Literal(households, datatype=XSD.integer)))
-        graph.add((stats_uri, GEO.averageIncome, Literal(income, datatype=XSD.decimal)))
-        graph.add((stats_uri, GEO.populationDensity, Literal(density, datatype=XSD.decimal)))
-        graph.add((stats_uri, GEO.unemploymentRate, Literal(unemployment, datatype=XSD.decimal)))
+build_indexes()
 
 
-init_data()
+def _dumps(value):
+    """Serialize a JSON-LD document, indented, for the text content of a tool result"""
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
 
 
 def get_statistics(location_id):
     """Get statistical data by location ID"""
-    stats_uri = URIRef(f"http://imx-geo-prime.org/statistics/{location_id}")
-
-    # Check if statistics exist
-    if (stats_uri, RDF.type, GEO.Municipality) not in graph:
+    stats = STATS.get(location_id)
+    if stats is None:
         return None
 
-    # Extract data
-    municipality = str(graph.value(stats_uri, GEO.municipality))
-    population = str(graph.value(stats_uri, GEO.population))
-    households = str(graph.value(stats_uri, GEO.households))
-    income = str(graph.value(stats_uri, GEO.averageIncome))
-    density = str(graph.value(stats_uri, GEO.populationDensity))
-    unemployment = str(graph.value(stats_uri, GEO.unemploymentRate))
-
+    # Numbers are rendered as text, as the JSON-LD output has always had them
     return {
-        "@context": {"geo": "http://imx-geo-prime.org/geospatial#"},
-        "@id": str(stats_uri),
+        "@context": CONTEXT,
+        "@id": stats["@id"],
         "@type": "geo:Municipality",
         "geo:locationId": location_id,
-        "geo:municipality": municipality,
-        "geo:population": population,
-        "geo:households": households,
-        "geo:averageIncome": income,
-        "geo:populationDensity": density,
-        "geo:unemploymentRate": unemployment,
+        "geo:municipality": stats["municipality"],
+        "geo:population": str(stats["population"]),
+        "geo:households": str(stats["households"]),
+        "geo:averageIncome": str(stats["averageIncome"]),
+        "geo:populationDensity": str(stats["populationDensity"]),
+        "geo:unemploymentRate": str(stats["unemploymentRate"]),
     }
 
 
 def list_locations():
     """List all locations with basic statistics"""
-    locations = []
-    for stats_uri in graph.subjects(RDF.type, GEO.Municipality):
-        loc_id = str(graph.value(stats_uri, GEO.locationId))
-        municipality = str(graph.value(stats_uri, GEO.municipality))
-        population = str(graph.value(stats_uri, GEO.population))
-
-        locations.append(
-            {
-                "@id": str(stats_uri),
-                "@type": "geo:Municipality",
-                "geo:locationId": loc_id,
-                "geo:municipality": municipality,
-                "geo:population": population,
-            }
-        )
+    locations = [
+        {
+            "@id": stats["@id"],
+            "@type": "geo:Municipality",
+            "geo:locationId": loc_id,
+            "geo:municipality": stats["municipality"],
+            "geo:population": str(stats["population"]),
+        }
+        for loc_id, stats in STATS.items()
+    ]
 
-    return {"@context": {"geo": "http://imx-geo-prime.org/geospatial#"}, "@graph": locations}
+    return {"@context": CONTEXT, "@graph": locations}
 
 
 def find_location(query):
     """Find locations by searching municipality name or location ID"""
     query_lower = query.lower()
-    results = []
+    if "\x00" in query_lower:
+        # NUL only separates the fields, neither contains it
+        return {"@context": CONTEXT, "@graph": []}
 
-    for stats_uri in graph.subjects(RDF.type, GEO.Municipality):
-        loc_id = str(graph.value(stats_uri, GEO.locationId))
-        municipality = str(graph.value(stats_uri, GEO.municipality))
-
-        # Search in municipality name and location ID
-        if query_lower in municipality.lower() or query_lower in loc_id.lower():
-            population = str(graph.value(stats_uri, GEO.population))
-            results.append(
-                {
-                    "@type": "geo:Municipality",
-                    "geo:locationId": loc_id,
-                    "geo:municipality": municipality,
-                    "geo:population": population,
-                }
-            )
+    # Search in municipality name and location ID
+    results = [entry for blob, entry in _SEARCH_INDEX if query_lower in blob]
 
-    return {"@context": {"geo": "http://imx-geo-prime.org/geospatial#"}, "@graph": results}
+    return {"@context": CONTEXT, "@graph": results}
 
 
 def get_demographics(location_id):
     """Get detailed demographic data by location ID"""
-    stats_uri = URIRef(f"http://imx-geo-prime.org/statistics/{location_id}")
-
-    if (stats_uri, RDF.type, GEO.Municipality) not in graph:
+    stats = STATS.get(location_id)
+    if stats is None:
         return None
 
-    municipality = str(graph.value(stats_uri, GEO.municipality))
-    population = int(str(graph.value(stats_uri, GEO.population)))
-    households = int(str(graph.value(stats_uri, GEO.households)))
+    population = stats["population"]
+    households = stats["households"]
 
     # Calculate derived statistics
     avg_household_size = round(population / households, 2) if households > 0 else 0
 
     return {
-        "@context": {"geo": "http://imx-geo-prime.org/geospatial#"},
-        "@id": str(stats_uri),
+        "@context": CONTEXT,
+        "@id": stats["@id"],
         "@type": "geo:Municipality",
         "geo:locationId": location_id,
-        "geo:municipality": municipality,
+        "geo:municipality": stats["municipality"],
         "geo:population": str(population),
         "geo:households": str(households),
         "derived:averageHouseholdSize": str(avg_household_size),
     }
 
 
-def handle_request(request):
-    """Handle MCP JSON-RPC request"""
-    method = request.get("method")
-    params = request.get("params", {})
-    request_id = request.get("id")
+# get_statistics and get_demographics return the same document for a location on every call,
+# so their serialized JSON-LD text is built once per known location ID, as is the one
+# list_locations document
+STATS_JSON: dict[str, str] = {loc_id: _dumps(get_statistics(loc_id)) for loc_id in STATS}
+DEMOGRAPHICS_JSON: dict[str, str] = {loc_id: _dumps(get_demographics(loc_id)) for loc_id in STATS}
+LOCATIONS_JSON = _dumps(list_locations())
 
-    if method == "initialize":
-        return {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "result": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {"tools": {}},
-                "serverInfo": {
-                    "name": "cbs-service",
-                    "version": "1.0.0",
-                    "description": (
-                        "CBS (Centraal Bureau voor de Statistiek / Statistics Netherlands) "
-                        "MCP Server. Provides official Dutch statistical data including "
-                        "population counts, household statistics, income data, and economic "
-                        "indicators. Data source: CBS StatLine (cbs.nl). "
-                        "Use this service for questions about: population numbers, "
-                        "demographics, household counts, average income, unemployment rates, "
-                        "and population density."
-                    ),
-                },
-            },
-        }
 
-    elif method == "tools/list":
-        return {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "result": {
-                "tools": [
-                    {
-                        "name": "find_location",
-                        "description": (
-                            "Search for municipalities by name to get their location identifiers. "
-                            "USE THIS TOOL FIRST when you don't know the location ID. "
-                            "This is the discovery tool for the CBS database. "
-                            "WORKFLOW: Call find_location('Amsterdam') to get LOC001, then use "
-                            "that ID with get_statistics or get_demographics. "
-                            "RETURNS: JSON-LD array of matching municipalities with: locationId "
-                            "(use this ID for other CBS tools), municipality name, population. "
-                            "SEARCH EXAMPLES: 'Amsterdam' returns LOC001, 'Utrecht' returns "
-                            "LOC002, 'Rotterdam' returns LOC003. Partial matches work."
-                        ),
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "query": {
-                                    "type": "string",
-                                    "description": (
-                                        "Search term: municipality/city name (e.g., 'Amsterdam') "
-                                        "or partial name (e.g., 'dam'). Case-insensitive matching."
-                                    ),
-                                }
-                            },
-                            "required": ["query"],
-                        },
-                    },
-                    {
-                        "name": "get_statistics",
+def _text_result(text, is_error=False):
+    """Build an MCP tools/call result holding one text item"""
+    result = {"content": [{"type": "text", "text": text}]}
+    if is_error:
+        result["isError"] = True
+    return result
+
+
+def find_location_result(query):
+    """Build the MCP result of find_location"""
+    result = find_location(query)
+
+    if not result["@graph"]:
+        return _text_result(
+            f"No municipalities found matching '{query}'. "
+            "Try searching by city name (Amsterdam, Utrecht, Rotterdam) "
+            "or use list_locations to see all available municipalities."
+        )
+
+    return _text_result(_dumps(result))
+
+
+def get_statistics_result(location_id):
+    """Build the MCP result of get_statistics"""
+    text = STATS_JSON.get(location_id)
+
+    if text is None:
+        return _text_result(f"Statistics for location {location_id} not found", is_error=True)
+
+    return _text_result(text)
+
+
+def get_demographics_result(location_id):
+    """Build the MCP result of get_demographics"""
+    text = DEMOGRAPHICS_JSON.get(location_id)
+
+    if text is None:
+        return _text_result(f"Demographics for location {location_id} not found", is_error=True)
+
+    return _text_result(text)
+
+
+# tools/call handlers by tool name, each taking the call's arguments
+_TOOL_HANDLERS = {
+    "find_location": lambda args: find_location_result(args.get("query", "")),
+    "get_statistics": lambda args: get_statistics_result(args.get("location_id")),
+    "list_locations": lambda args: _text_result(LOCATIONS_JSON),
+    "get_demographics": lambda args: get_demographics_result(args.get("location_id")),
+}
+
+
+# The initialize and tools/list results never change, so they are built once
+_INITIALIZE_RESULT = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {"tools": {}},
+    "serverInfo": {
+        "name": "cbs-service",
+        "version": "1.0.0",
+        "description": (
+            "CBS (Centraal Bureau voor de Statistiek / Statistics Netherlands) "
+            "MCP Server. Provides official Dutch statistical data including "
+            "population counts, household statistics, income data, and economic "
+            "indicators. Data source: CBS StatLine (cbs.nl). "
+            "Use this service for questions about: population numbers, "
+            "demographics, household counts, average income, unemployment rates, "
+            "and population density."
+        ),
+    },
+}
+
+_TOOLS_LIST_RESULT = {
+    "tools": [
+        {
+            "name": "find_location",
+            "description": (
+                "Search for municipalities by name to get their location identifiers. "
+                "USE THIS TOOL FIRST when you don't know the location ID. "
+                "This is the discovery tool for the CBS database. "
+                "WORKFLOW: Call find_location('Amsterdam') to get LOC001, then use "
+                "that ID with get_statistics or get_demographics. "
+                "RETURNS: JSON-LD array of matching municipalities with: locationId "
+                "(use this ID for other CBS tools), municipality name, population. "
+                "SEARCH EXAMPLES: 'Amsterdam' returns LOC001, 'Utrecht' returns "
+                "LOC002, 'Rotterdam' returns LOC003. Partial matches work."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
                         "description": (
-                            "Retrieve comprehensive statistical data for a municipality from "
-                            "CBS (Statistics Netherlands). "
-                            "PREREQUISITE: First use find_location to get valid location IDs, "
-                            "or use list_locations to see all available municipalities. "
-                            "USE THIS TOOL WHEN: You need population numbers, income statistics, "
-                            "unemployment data, or population density for a specific location. "
-                            "RETURNS: JSON-LD with fields: municipality (city name), "
-                            "population (total inhabitants as integer), households (number of "
-                            "households), averageIncome (in EUR per year), populationDensity "
-                            "(inhabitants per km²), unemploymentRate (percentage). "
-                            "DATA SEMANTICS: Population uses geo:population predicate, linked to "
-                            "municipality via geo:locationId. All monetary values in EUR. "
-                            "EXAMPLE: For LOC001 (Amsterdam), returns population 872,680, "
-                            "465,242 households, avg income €38,500, density 5,135/km²."
+                            "Search term: municipality/city name (e.g., 'Amsterdam') "
+                            "or partial name (e.g., 'dam'). Case-insensitive matching."
                         ),
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "location_id": {
-                                    "type": "string",
-                                    "description": (
-                                        "Location identifier obtained from find_location or "
-                                        "list_locations. Format: 'LOC' followed by digits "
-                                        "(e.g., 'LOC001' for Amsterdam)."
-                                    ),
-                                }
-                            },
-                            "required": ["location_id"],
-                        },
-                    },
-                    {
-                        "name": "list_locations",
+                    }
+                },
+                "required": ["query"],
+            },
+        },
+        {
+            "name": "get_statistics",
+            "description": (
+                "Retrieve comprehensive statistical data for a municipality from "
+                "CBS (Statistics Netherlands). "
+                "PREREQUISITE: First use find_location to get valid location IDs, "
+                "or use list_locations to see all available municipalities. "
+                "USE THIS TOOL WHEN: You need population numbers, income statistics, "
+                "unemployment data, or population density for a specific location. "
+                "RETURNS: JSON-LD with fields: municipality (city name), "
+                "population (total inhabitants as integer), households (number of "
+                "households), averageIncome (in EUR per year), populationDensity "
+                "(inhabitants per km²), unemploymentRate (percentage). "
+                "DATA SEMANTICS: Population uses geo:population predicate, linked to "
+                "municipality via geo:locationId. All monetary values in EUR. "
+                "EXAMPLE: For LOC001 (Amsterdam), returns population 872,680, "
+                "465,242 households, avg income €38,500, density 5,135/km²."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "location_id": {
+                        "type": "string",
                         "description": (
-                            "List ALL municipalities in the CBS database with basic population "
-                            "data. USE THIS TOOL WHEN: You need to discover available locations, "
-                            "compare populations across cities, or get a quick overview. "
-                            "ALTERNATIVE TO: find_location (use when you don't have a search "
-                            "term). RETURNS: JSON-LD array with summary for each municipality: "
-                            "locationId, municipality name, population. No parameters required."
+                            "Location identifier obtained from find_location or "
+                            "list_locations. Format: 'LOC' followed by digits "
+                            "(e.g., 'LOC001' for Amsterdam)."
                         ),
-                        "inputSchema": {"type": "object", "properties": {}},
-                    },
-                    {
-                        "name": "get_demographics",
+                    }
+                },
+                "required": ["location_id"],
+            },
+        },
+        {
+            "name": "list_locations",
+            "description": (
+                "List ALL municipalities in the CBS database with basic population "
+                "data. USE THIS TOOL WHEN: You need to discover available locations, "
+                "compare populations across cities, or get a quick overview. "
+                "ALTERNATIVE TO: find_location (use when you don't have a search "
+                "term). RETURNS: JSON-LD array with summary for each municipality: "
+                "locationId, municipality name, population. No parameters required."
+            ),
+            "inputSchema": {"type": "object", "properties": {}},
+        },
+        {
+            "name": "get_demographics",
+            "description": (
+                "Retrieve household-focused demographic data with derived statistics. "
+                "PREREQUISITE: First use find_location to get valid location IDs. "
+                "USE THIS TOOL WHEN: You specifically need household size information "
+                "or want population-to-household ratios. For general statistics "
+                "(income, unemployment, density), use get_statistics instead. "
+                "RETURNS: JSON-LD with fields: municipality, population, households, "
+                "averageHouseholdSize (calculated: population/households). "
+                "DATA SEMANTICS: Household size is derived (not raw CBS data). "
+                "EXAMPLE: For LOC001 (Amsterdam), returns avg household size of 1.88 "
+                "(872,680 people / 465,242 households)."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "location_id": {
+                        "type": "string",
                         "description": (
-                            "Retrieve household-focused demographic data with derived statistics. "
-                            "PREREQUISITE: First use find_location to get valid location IDs. "
-                            "USE THIS TOOL WHEN: You specifically need household size information "
-                            "or want population-to-household ratios. For general statistics "
-                            "(income, unemployment, density), use get_statistics instead. "
-                            "RETURNS: JSON-LD with fields: municipality, population, households, "
-                            "averageHouseholdSize (calculated: population/households). "
-                            "DATA SEMANTICS: Household size is derived (not raw CBS data). "
-                            "EXAMPLE: For LOC001 (Amsterdam), returns avg household size of 1.88 "
-                            "(872,680 people / 465,242 households)."
+                            "Location identifier obtained from find_location or "
+                            "list_locations. Format: 'LOC' followed by digits."
                         ),
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "location_id": {
-                                    "type": "string",
-                                    "description": (
-                                        "Location identifier obtained from find_location or "
-                                        "list_locations. Format: 'LOC' followed by digits."
-                                    ),
-                                }
-                            },
-                            "required": ["location_id"],
-                        },
-                    },
-                ]
+                    }
+                },
+                "required": ["location_id"],
             },
-        }
+        },
+    ]
+}
 
-    elif method == "tools/call":
-        tool_name = params.get("name")
-        tool_args = params.get("arguments", {})
-
-        if tool_name == "find_location":
-            query = tool_args.get("query", "")
-            result = find_location(query)
-
-            if not result.get("@graph"):
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": (
-                                    f"No municipalities found matching '{query}'. "
-                                    "Try searching by city name (Amsterdam, Utrecht, Rotterdam) "
-                                    "or use list_locations to see all available municipalities."
-                                ),
-                            }
-                        ],
-                    },
-                }
-
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
 
-        elif tool_name == "get_statistics":
-            location_id = tool_args.get("location_id")
-            result = get_statistics(location_id)
-
-            if result is None:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"Statistics for location {location_id} not found",
-                            }
-                        ],
-                        "isError": True,
-                    },
-                }
-
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
+def handle_initialize(request_id, params):
+    """Answer the MCP initialize handshake"""
+    return {"jsonrpc": "2.0", "id": request_id, "result": _INITIALIZE_RESULT}
 
-        elif tool_name == "list_locations":
-            result = list_locations()
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
 
-        elif tool_name == "get_demographics":
-            location_id = tool_args.get("location_id")
-            result = get_demographics(location_id)
-
-            if result is None:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"Demographics for location {location_id} not found",
-                            }
-                        ],
-                        "isError": True,
-                    },
-                }
-
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {"content": [{"type": "text", "text": json.dumps(result, indent=2)}]},
-            }
+def handle_tools_list(request_id, params):
+    """List the tools this server provides"""
+    return {"jsonrpc": "2.0", "id": request_id, "result": _TOOLS_LIST_RESULT}
+
+
+def handle_tools_call(request_id, params):
+    """Run a tool; None for an unknown tool"""
+    handler = _TOOL_HANDLERS.get(params.get("name"))
+    if handler is None:
+        return None
+    return {"jsonrpc": "2.0", "id": request_id, "result": handler(params.get("arguments", {}))}
+
+
+# JSON-RPC handlers by method name
+_METHOD_HANDLERS = {
+    "initialize": handle_initialize,
+    "tools/list": handle_tools_list,
+    "tools/call": handle_tools_call,
+}
+
+
+def handle_request(request):
+    """Handle MCP JSON-RPC request"""
+    method = request.get("method")
+    request_id = request.get("id")
+
+    handler = _METHOD_HANDLERS.get(method)
+    response = handler(request_id, request.get("params", {})) if handler else None
+    if response is not None:
+        return response
 
     # Unknown method
     return {
@@ -428,18 +401,22 @@ def handle_request(request):
 
 def main():
     """Main MCP server loop using stdio transport"""
-    for line in sys.stdin:
+    # Read and write bytes directly; orjson parses the raw request lines without decoding them
+    out = sys.stdout.buffer
+    for line in sys.stdin.buffer:
         try:
-            request = json.loads(line)
-            response = handle_request(request)
-            print(json.dumps(response), flush=True)
+            request = orjson.loads(line)
+            response = orjson.dumps(handle_request(request), option=orjson.OPT_APPEND_NEWLINE)
         except Exception as e:
             error_response = {
                 "jsonrpc": "2.0",
                 "id": None,
                 "error": {"code": -32603, "message": str(e)},
             }
-            print(json.dumps(error_response), flush=True)
+            response = orjson.dumps(error_response, option=orjson.OPT_APPEND_NEWLINE)
+        # One write and flush per response, so each reaches the pipe in a single syscall
+        out.write(response)
+        out.flush()
 
 
 if __name__ == "__main__":